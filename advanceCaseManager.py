@@ -1,19 +1,30 @@
 import re
+import json
+import hashlib
+import functools
+import math
 import subprocess
-import tiktoken
+import sys
+import threading
 from colorama import init, Fore, Style
-import markdown2
 import time
-from weasyprint import HTML
 import os
-from openai import OpenAI
 import shutil
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tabulate import tabulate
-from tqdm import tqdm
-from dotenv import load_dotenv, set_key, unset_key
+import caseBatch
+import caseIndex
+import caseMeta
+import caseNotes
+import casePager
+import caseSearch
+import caseIndicators
+import vaultTemplate
+import aiClient
 
 BASE_DIR = os.path.expanduser("~/Investigations")
+CASES_PER_PAGE = 20  # rows per page in List Cases and the case picker
 
 init(autoreset=True) 
 
@@ -27,13 +38,46 @@ SUBFOLDERS = [
     "99. Tasks"
 ]
 
+AI_MAX_CONCURRENCY = 4  # chunk requests kept in flight by the AI report
+AI_CACHE = aiClient.ResponseCache(os.path.join(BASE_DIR, ".ai_cache"))
+
+# Generated reports live in "4. Report" but must not feed back into the next report
+REPORT_FILE_RE = re.compile(r"^Case_.+_Report(_\d{8}_\d{6})?\.md$")
+MANIFEST_VERSION = 1
+TOKENIZER_THREADS = 8
+TOKEN_COUNTS_MAX_ROWS = 20000  # persisted note counts kept; the oldest are pruned past this
+TOKEN_MEMO_MAX = 4096  # in-memory counts for transient text (split blocks, merge inputs)
+REDUCE_MAX_TOKENS = 3000  # input budget for each merge request in the reduce phase
+CHUNK_PIECE_OVERHEAD = 20  # tokens for the "📄 Path:" header wrapped around each piece
+PRIORITIES_REL_PATH = os.path.join("5. Strategic Priorities", "5. Strategic Priorities.md")
+MD_HEADING_RE = re.compile(r"(?m)^(?=#{1,6}\s)")
+MD_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+# Token counts of whole notes keyed by content hash, so unchanged notes are
+# never re-tokenised. token_counts is the unbounded table of earlier versions.
+caseIndex.register_schema("""
+    DROP TABLE IF EXISTS token_counts;
+    CREATE TABLE IF NOT EXISTS note_token_counts (
+        hash TEXT NOT NULL,
+        model TEXT NOT NULL,
+        tokens INTEGER NOT NULL,
+        added_at REAL NOT NULL,
+        PRIMARY KEY (hash, model)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS note_token_counts_age ON note_token_counts (added_at);
+""")
+_token_memo = {}
+_token_memo_lock = threading.Lock()
+
 
 def get_api_key():
+    from dotenv import load_dotenv  # loaded on first use to keep startup fast
     load_dotenv(dotenv_path=os.path.join(BASE_DIR, ".env"))
     return os.getenv("OPENAI_API_KEY")
 
 
 def manage_api_key():
+    from dotenv import load_dotenv, set_key, unset_key
     env_path = os.path.join(BASE_DIR, ".env")
     load_dotenv(dotenv_path=env_path)
 
@@ -53,22 +97,25 @@ def manage_api_key():
         new_key = input("Enter new OpenAI API Key: ").strip()
         if new_key.startswith("sk-") and len(new_key) > 20:
             set_key(env_path, "OPENAI_API_KEY", new_key)
+            os.environ["OPENAI_API_KEY"] = new_key
+            aiClient.reset_client()
             print("✅ API key updated.")
         else:
             print("❌ Invalid API key format.")
     elif choice == "2":
         unset_key(env_path, "OPENAI_API_KEY")
+        os.environ.pop("OPENAI_API_KEY", None)
+        aiClient.reset_client()
         print("✅ API key cleared.")
     elif choice == "3":
         return
     else:
         print("❌ Invalid choice.")
 
-def create_case(case_id, status, description, payment_status="Not Paid"):
+def provision_case(case_id, status, description, payment_status="Not Paid", tags=()):
+    # Folders, templates, case.json/notes.txt and vault settings — no index or UI work, so
+    # bulk intake can run this from worker threads. Raises FileExistsError if taken.
     case_folder = os.path.join(BASE_DIR, f"Case_{case_id}")
-    if os.path.exists(case_folder):
-        print(f"❌ Case {case_id} already exists.")
-        return
     os.makedirs(case_folder)
 
     for sub in SUBFOLDERS:
@@ -91,74 +138,154 @@ def create_case(case_id, status, description, payment_status="Not Paid"):
             else:
                 md_file.write(f"# {sub}\n")
 
-    with open(os.path.join(case_folder, "notes.txt"), "w") as f:
-        f.write(f"Case ID: {case_id}\n")
-        f.write(f"Status: {status}\n")
-        f.write(f"Description: {description}\n")
-        f.write(f"Payment Status: {payment_status}\n")
-        f.write(f"Created: {datetime.now()}\n")
-
-    print(f"✅ Case {case_id} created successfully.")
-
-    try:
-        intro_md = os.path.join(case_folder, "0. Introduction", "0. Introduction.md")
-        subprocess.run(["open", "-a", "Obsidian", intro_md])
-        print(f"\n🚀 Obsidian has been opened.")
-        print("📌 To begin working with this case as a vault:")
-        print(f"1. In Obsidian, click 'Open folder as vault'")
-        print(f"2. Select: {case_folder}")
-        print(f"3. (Optional) Enable plugins or templates specific to this case.\n")
-    except Exception as e:
-        print(f"⚠️ Could not open in Obsidian: {e}")
+    # 🗂️ case.json holds the typed record; notes.txt is rendered from it
+    record = caseMeta.make_record(case_id, status, description, payment_status, tags=tags)
+    caseMeta.save(case_folder, record)
 
     VAULT_TEMPLATE = os.path.expanduser("~/vault_template/.obsidian")
 
     if os.path.exists(VAULT_TEMPLATE):
         try:
-            shutil.copytree(VAULT_TEMPLATE, os.path.join(case_folder, ".obsidian"))
+            # Reflinks/hardlinks where possible; only files Obsidian edits are real copies
+            vaultTemplate.provision(VAULT_TEMPLATE, os.path.join(case_folder, ".obsidian"))
             print("📦 Obsidian vault settings applied to new case.")
         except FileExistsError:
             print("⚠️ .obsidian folder already exists in this case. Skipping template.")
 
+    return case_folder, record
 
-def list_cases(return_data=False):
-    if not os.path.exists(BASE_DIR):
-        print("📁 No cases found.")
-        return [] if return_data else None
+
+def create_case(case_id, status, description, payment_status="Not Paid", open_obsidian=True, tags=()):
+    case_folder = os.path.join(BASE_DIR, f"Case_{case_id}")
+    if os.path.exists(case_folder):
+        print(f"❌ Case {case_id} already exists.")
+        return None
+    case_folder, record = provision_case(case_id, status, description, payment_status, tags)
+    caseIndex.record_case(BASE_DIR, record)
+
+    print(f"✅ Case {case_id} created successfully.")
+
+    if open_obsidian:
+        try:
+            intro_md = os.path.join(case_folder, "0. Introduction", "0. Introduction.md")
+            subprocess.run(["open", "-a", "Obsidian", intro_md])
+            print(f"\n🚀 Obsidian has been opened.")
+            print("📌 To begin working with this case as a vault:")
+            print(f"1. In Obsidian, click 'Open folder as vault'")
+            print(f"2. Select: {case_folder}")
+            print(f"3. (Optional) Enable plugins or templates specific to this case.\n")
+        except Exception as e:
+            print(f"⚠️ Could not open in Obsidian: {e}")
+
+    return case_folder
+
+
+def show_case_page(page=1, refresh=True, **query):
+    # Filter, sort and slice in the index; only the visible page is formatted.
+    # Returns (case IDs on the page, number of matching cases).
+    first = (page - 1) * CASES_PER_PAGE
+    cases, total = caseIndex.query_cases(BASE_DIR, limit=CASES_PER_PAGE, offset=first, refresh=refresh, **query)
+    if total == 0:
+        print("📁 No cases match these filters." if caseIndex.has_filters(query) else "📁 No cases found.")
+        return [], 0
 
     # Get terminal width
     term_width = shutil.get_terminal_size((120, 20)).columns
     desc_max_width = max(30, min(90, term_width - 80))  # dynamic but capped
 
     table = []
-    case_data = []
-
-    for folder in os.listdir(BASE_DIR):
-        case_path = os.path.join(BASE_DIR, folder)
-        notes_file = os.path.join(case_path, "notes.txt")
-        if os.path.exists(notes_file):
-            with open(notes_file, "r") as f:
-                lines = f.readlines()
-                status = next((line.split(":")[1].strip() for line in lines if line.startswith("Status:")), "")
-                description = next((line.split(":")[1].strip() for line in lines if line.startswith("Description:")), "")
-                case_id = folder.replace("Case_", "")
-                payment_status = next((line.split(":")[1].strip() for line in lines if line.startswith("Payment Status:")), "")
-
-                # Truncate long descriptions
-                if len(description) > desc_max_width:
-                    description = description[:desc_max_width - 3] + "..."
-
-                table.append([len(case_data)+1, case_id, status, description, payment_status])
-                case_data.append(case_id)
+    for n, case in enumerate(cases, start=first + 1):
+        description = case["description"]
+
+        # Truncate long descriptions
+        if len(description) > desc_max_width:
+            description = description[:desc_max_width - 3] + "..."
+
+        table.append([n, case["case_id"], case["status"], description, case["payment_status"]])
 
     print(tabulate(
         table,
         headers=["#", "Case ID", "Status", "Description", "Payment Status"],
         tablefmt="fancy_grid"
     ))
+    print(f"📄 Page {page} of {max(1, -(-total // CASES_PER_PAGE))} — {total} case(s)")
+    return [case["case_id"] for case in cases], total
 
+
+def list_cases(return_data=False, page=1, **query):
+    # query: status, payment_status, created_from, created_to, text, tag, sort, descending
+    if not os.path.exists(BASE_DIR):
+        print("📁 No cases found.")
+        return [] if return_data else None
+
+    case_data, _ = show_case_page(page, **query)
     return case_data if return_data else None
 
+
+def ask_case_filters():
+    # Filters for browse_cases(); an empty answer leaves that field unfiltered
+    filters = {}
+    status = input("Status — 1. Open  2. Closed  (Enter for any): ").strip()
+    filters["status"] = {"1": "Open", "2": "Closed"}.get(status)
+    payment = input("Payment — 1. Not Paid  2. Partial Payment  3. Paid  (Enter for any): ").strip()
+    filters["payment_status"] = {"1": "Not Paid", "2": "Partial Payment", "3": "Paid"}.get(payment)
+    filters["created_from"] = input("Created from (YYYY-MM-DD, Enter for any): ").strip() or None
+    filters["created_to"] = input("Created up to (YYYY-MM-DD, Enter for any): ").strip() or None
+    filters["text"] = input("Description contains (Enter for any): ").strip() or None
+    filters["tag"] = input("Tag (Enter for any): ").strip() or None
+    return filters
+
+
+def ask_case_sort():
+    keys = {"1": "case_id", "2": "created", "3": "status", "4": "payment_status"}
+    print("Sort by: 1. Case ID  2. Created  3. Status  4. Payment Status")
+    sort = keys.get(input("Enter choice: ").strip(), "case_id")
+    descending = input("Newest/highest first? (y/N): ").strip().lower() == "y"
+    return {"sort": sort, "descending": descending}
+
+
+def browse_cases(select=False):
+    # Page through the index with filters and sorting. With select=True,
+    # returns the case ID picked by its number (or None).
+    query = {}
+    page = 1
+    # Refresh (throttled) once when the listing opens; page turns and filter
+    # changes then only query the index
+    caseIndex.ensure_index(BASE_DIR)
+    caseIndex.refresh_if_stale(BASE_DIR)
+    while True:
+        case_ids, total = show_case_page(page, refresh=False, **query)
+        if total == 0 and not caseIndex.has_filters(query):
+            return None
+        pages = max(1, -(-total // CASES_PER_PAGE))
+        actions = "[n]ext  [p]rev  [f]ilter  [s]ort  [c]lear filters"
+        if select:
+            actions += "  or a case number"
+        choice = input(f"{actions}  (Enter to go back): ").strip().lower()
+
+        if not choice:
+            return None
+        elif choice == "n":
+            page = min(pages, page + 1)
+        elif choice == "p":
+            page = max(1, page - 1)
+        elif choice == "f":
+            query.update(ask_case_filters())
+            page = 1
+        elif choice == "s":
+            query.update(ask_case_sort())
+            page = 1
+        elif choice == "c":
+            query = {key: value for key, value in query.items() if key in ("sort", "descending")}
+            page = 1
+        elif select and choice.isdigit():
+            position = int(choice) - (page - 1) * CASES_PER_PAGE - 1
+            if 0 <= position < len(case_ids):
+                return case_ids[position]
+            print("❌ Invalid selection. Pick a number shown on this page.")
+        else:
+            print("❌ Invalid choice.")
+
 def view_case(case_id):
     case_path = os.path.join(BASE_DIR, f"Case_{case_id}")
     notes_file = os.path.join(case_path, "notes.txt")
@@ -202,12 +329,7 @@ def view_case(case_id):
                         first_line = md_file.readline().strip()
                         if first_line:
                             # 🔗 Shorten URLs in preview line
-                            urls = re.findall(r'(https?://[^\s)]+)', first_line)
-                            for url in urls:
-                                if len(url) > 30:
-                                    short_url = url[:30] + "..."
-                                    first_line = first_line.replace(url, short_url)
-                            preview = f" - 📝 {first_line}"
+                            preview = f" - 📝 {casePager.shorten_urls(first_line)}"
                             break
             print(f"📁 {sub:<25} {num_files} file{'s' if num_files != 1 else ''} | Last Modified: {last_mod}{preview}")
             folder_map[sub] = [os.path.join(sub_path, f) for f in files if f.endswith(".md")]
@@ -220,61 +342,44 @@ def view_case(case_id):
         print("↩️ Returning to main menu.")
         return
 
-    print("\n💡 " + Style.BRIGHT + "Deep Dive Into Case Notes:\n")
-
-    for folder, md_files in folder_map.items():
-        print(Fore.CYAN + Style.BRIGHT + f"=== {folder} ===")
-        for md_file in md_files:
-            print(Fore.YELLOW + f"\n📄 {os.path.basename(md_file)}")
-            with open(md_file, "r") as f:
-                for line in f:
-                    line = line.rstrip()
-                    if line.startswith("#"):
-                        print(Fore.GREEN + Style.BRIGHT + line)
-                    elif line.strip():
-                        # 🔗 Truncate URLs in the line
-                        urls = re.findall(r'(https?://[^\s)]+)', line)
-                        for url in urls:
-                            if len(url) > 30:
-                                short_url = url[:30] + "..."
-                                line = line.replace(url, short_url)
-                        print(Fore.WHITE + line)
-            print("\n" + "-" * 40)
+    print("\n💡 " + Style.BRIGHT + "Deep Dive Into Case Notes:")
+
+    # 📖 One page at a time, read lazily; jump between sections and files
+    casePager.page_through(list(folder_map.items()))
 
     print("\n✅ Deep dive complete.")
 
 
-def update_status(case_id, new_status):
-    notes_file = os.path.join(BASE_DIR, f"Case_{case_id}", "notes.txt")
-    if not os.path.exists(notes_file):
+def update_status(case_id, new_status, expected_version=None):
+    case_path = os.path.join(BASE_DIR, f"Case_{case_id}")
+    if not os.path.exists(os.path.join(case_path, "notes.txt")):
         print(f"❌ Case {case_id} not found.")
-        return
-    with open(notes_file, "r") as f:
-        lines = f.readlines()
-    with open(notes_file, "w") as f:
-        for line in lines:
-            if line.startswith("Status:"):
-                f.write(f"Status: {new_status}\n")
-            else:
-                f.write(line)
+        return False
+    try:
+        # 🔒 Locked, atomic rewrite; refuses if the case moved past revision expected_version
+        record = caseMeta.update_case(case_path, {"status": new_status}, expected_version)
+    except caseNotes.NotesConflict:
+        print(f"❌ Case {case_id} was changed by someone else in the meantime. Reload it and try again.")
+        return False
+    caseIndex.record_case(BASE_DIR, record)
     print(f"✅ Status updated for Case {case_id}.")
+    return True
 
-def update_status_and_payment(case_id, new_status, new_payment_status):
-    notes_file = os.path.join(BASE_DIR, f"Case_{case_id}", "notes.txt")
-    if not os.path.exists(notes_file):
+def update_status_and_payment(case_id, new_status, new_payment_status, expected_version=None):
+    case_path = os.path.join(BASE_DIR, f"Case_{case_id}")
+    if not os.path.exists(os.path.join(case_path, "notes.txt")):
         print(f"❌ Case {case_id} not found.")
-        return
-    with open(notes_file, "r") as f:
-        lines = f.readlines()
-    with open(notes_file, "w") as f:
-        for line in lines:
-            if line.startswith("Status:"):
-                f.write(f"Status: {new_status}\n")
-            elif line.startswith("Payment Status:"):
-                f.write(f"Payment Status: {new_payment_status}\n")
-            else:
-                f.write(line)
+        return False
+    try:
+        record = caseMeta.update_case(
+            case_path, {"status": new_status, "payment_status": new_payment_status}, expected_version
+        )
+    except caseNotes.NotesConflict:
+        print(f"❌ Case {case_id} was changed by someone else in the meantime. Reload it and try again.")
+        return False
+    caseIndex.record_case(BASE_DIR, record)
     print(f"✅ Status and payment updated for Case {case_id}.")
+    return True
 
 def open_case_in_obsidian(case_id):
     case_path = os.path.join(BASE_DIR, f"Case_{case_id}")
@@ -289,172 +394,518 @@ def open_case_in_obsidian(case_id):
         print(f"⚠️ Could not open Obsidian: {e}")
 
 def select_case():
-    case_list = list_cases(return_data=True)
-    if not case_list:
-        return None
-    try:
-        choice = int(input("Select case by number: "))
-        if 1 <= choice <= len(case_list):
-            return case_list[choice - 1]
-        else:
-            print("❌ Invalid selection.")
-            return None
-    except ValueError:
-        print("❌ Invalid input. Please enter a number.")
-        return None
+    return browse_cases(select=True)
+
+def search_cases():
+    query = input("🔎 Enter search terms: ").strip()
+    if not query:
+        print("❌ Search query cannot be empty.")
+        return
+
+    start = time.perf_counter()
+    results = caseSearch.search(BASE_DIR, query)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if not results:
+        print(f"📭 No matches for '{query}'.")
+        return
+
+    table = []
+    for r in results:
+        text = r["text"] if len(r["text"]) <= 80 else r["text"][:77] + "..."
+        table.append([r["case_id"], r["path"], r["line"], text])
+    print(tabulate(table, headers=["Case ID", "File", "Line", "Text"], tablefmt="fancy_grid"))
+    print(f"🔎 {len(results)} match{'es' if len(results) != 1 else ''} in {elapsed_ms:.1f} ms")
+
+def lookup_indicator():
+    value = input("🧭 Enter wallet/URL/email/@handle (blank = show indicators shared across cases): ").strip()
+
+    if not value:
+        shared = caseIndicators.shared_indicators(BASE_DIR)
+        if not shared:
+            print("📭 No indicators appear in more than one case.")
+            return
+        table = [[s["kind"], s["value"], s["case_count"], s["cases"]] for s in shared]
+        print(tabulate(table, headers=["Type", "Indicator", "Cases", "Case IDs"], tablefmt="fancy_grid"))
+        return
+
+    hits = caseIndicators.lookup(BASE_DIR, value)
+    if not hits:
+        print(f"📭 '{value}' does not appear in any case.")
+        return
+
+    case_ids = sorted({h["case_id"] for h in hits})
+    table = [[h["case_id"], h["rel_path"], h["line_no"]] for h in hits]
+    print(tabulate(table, headers=["Case ID", "File", "Line"], tablefmt="fancy_grid"))
+    print(f"🧭 Found in {len(case_ids)} case{'s' if len(case_ids) != 1 else ''}: {', '.join(case_ids)}")
 
-def delete_case(case_id):
+def delete_case(case_id, confirm=True):
     case_folder = os.path.join(BASE_DIR, f"Case_{case_id}")
     if os.path.exists(case_folder):
-        confirm = input(f"⚠️ Are you sure you want to delete Case {case_id}? (yes/no): ")
-        if confirm.lower() == "yes":
+        answer = input(f"⚠️ Are you sure you want to delete Case {case_id}? (yes/no): ") if confirm else "yes"
+        if answer.lower() == "yes":
             shutil.rmtree(case_folder)
+            caseIndex.forget_case(BASE_DIR, case_id)
             print(f"🗑️ Case {case_id} deleted.")
+            return True
     else:
         print(f"❌ Case {case_id} not found.")
+    return False
+
+@functools.lru_cache(maxsize=None)
+def get_encoder(model="gpt-4"):
+    # encoding_for_model rebuilds its lookup every call; resolve once per model.
+    # tiktoken is only imported here, the first time an AI report needs it.
+    import tiktoken
+    return tiktoken.encoding_for_model(model)
 
 def num_tokens_from_string(string, model="gpt-4"):
-    encoding = tiktoken.encoding_for_model(model)
-    return len(encoding.encode(string))
+    return len(get_encoder(model).encode(string, disallowed_special=()))
+
+def _remember_tokens(counts):
+    with _token_memo_lock:
+        _token_memo.update(counts)
+        while len(_token_memo) > TOKEN_MEMO_MAX:
+            del _token_memo[next(iter(_token_memo))]
+
+def _load_note_tokens(conn, hashes, model):
+    known = {}
+    for i in range(0, len(hashes), 500):
+        batch = hashes[i:i + 500]
+        rows = conn.execute(
+            f"SELECT hash, tokens FROM note_token_counts WHERE model = ? AND hash IN ({','.join('?' * len(batch))})",
+            (model, *batch)
+        ).fetchall()
+        known.update(((row["hash"], model), row["tokens"]) for row in rows)
+    return known
+
+def _save_note_tokens(conn, counts):
+    now = time.time()
+    conn.executemany(
+        "INSERT OR REPLACE INTO note_token_counts (hash, model, tokens, added_at) VALUES (?, ?, ?, ?)",
+        [(h, model, n, now) for (h, model), n in counts.items()]
+    )
+    excess = conn.execute("SELECT COUNT(*) FROM note_token_counts").fetchone()[0] - TOKEN_COUNTS_MAX_ROWS
+    if excess > 0:
+        conn.execute(
+            "DELETE FROM note_token_counts WHERE (hash, model) IN "
+            "(SELECT hash, model FROM note_token_counts ORDER BY added_at LIMIT ?)",
+            (excess,)
+        )
+    conn.commit()
+
+def num_tokens_for_texts(texts, model="gpt-4", persist=False):
+    # Counts for many texts at once: repeats are answered from a bounded
+    # in-memory memo, the rest is batch-encoded across threads. persist=True
+    # is for whole note contents only: their counts also go to the index so
+    # unchanged notes are not re-tokenised by the next run. Transient text
+    # (split blocks, merge inputs) stays in memory.
+    keys = [(content_hash(text), model) for text in texts]
+    with _token_memo_lock:
+        known = {key: _token_memo[key] for key in keys if key in _token_memo}
+    conn = None
+    if persist:
+        conn = caseIndex.get_connection(BASE_DIR)
+        unknown = list(dict.fromkeys(h for h, _ in keys if (h, model) not in known))
+        known.update(_load_note_tokens(conn, unknown, model))
+
+    missing = {}
+    for text, key in zip(texts, keys):
+        if key not in known:
+            missing.setdefault(key, text)
+    if missing:
+        encoded = get_encoder(model).encode_batch(
+            list(missing.values()), num_threads=TOKENIZER_THREADS, disallowed_special=()
+        )
+        counts = {key: len(tokens) for key, tokens in zip(missing, encoded)}
+        if conn is not None:
+            _save_note_tokens(conn, counts)
+        known.update(counts)
+
+    _remember_tokens({key: known[key] for key in keys})
+    return [known[key] for key in keys]
+
+def _split_token_window(text, max_tokens, model="gpt-4"):
+    # Last resort for a single line longer than the budget
+    encoder = get_encoder(model)
+    tokens = encoder.encode(text, disallowed_special=())
+    return [encoder.decode(tokens[i:i + max_tokens]) for i in range(0, len(tokens), max_tokens)]
+
+def split_markdown(text, max_tokens):
+    # Break a note into blocks that each fit max_tokens, cutting on headings
+    # first, then blank-line paragraphs, then single lines.
+    splitters = (
+        lambda block: MD_HEADING_RE.split(block),
+        lambda block: MD_PARAGRAPH_RE.split(block),
+        lambda block: block.split("\n"),
+    )
+    blocks = [text]
+    counts = num_tokens_for_texts(blocks)
+    for splitter in splitters:
+        if all(count <= max_tokens for count in counts):
+            return blocks, counts
+        next_blocks = []
+        for block, count in zip(blocks, counts):
+            next_blocks.extend(splitter(block) if count > max_tokens else [block])
+        blocks = [block.strip("\n") for block in next_blocks if block.strip()]
+        counts = num_tokens_for_texts(blocks)
+
+    final = []
+    for block, count in zip(blocks, counts):
+        final.extend(_split_token_window(block, max_tokens) if count > max_tokens else [block])
+    return final, num_tokens_for_texts(final)
+
+def split_file_into_pieces(text, tokens, max_tokens):
+    # Returns [(content, tokens)] with consecutive blocks merged back up to the budget
+    if tokens <= max_tokens:
+        return [(text, tokens)]
+    blocks, counts = split_markdown(text, max_tokens)
+    pieces = []
+    current, current_tokens = [], 0
+    for block, count in zip(blocks, counts):
+        if current and current_tokens + count + 2 > max_tokens:
+            pieces.append(("\n\n".join(current), current_tokens))
+            current, current_tokens = [], 0
+        current.append(block)
+        current_tokens += count + (2 if len(current) > 1 else 0)
+    if current:
+        pieces.append(("\n\n".join(current), current_tokens))
+    return pieces
 
 def chunk_content_map(content_map, max_tokens=3000):
-    current_chunk = []
-    current_tokens = 0
-    chunks = []
-
-    for item in content_map:
-        path = item["path"]
-        content = item["content"][:5000]  # optional safety trim
-        tokens = num_tokens_from_string(content)
-
-        if current_tokens + tokens > max_tokens:
-            chunks.append(current_chunk)
-            current_chunk = []
-            current_tokens = 0
-
-        current_chunk.append((path, content))
-        current_tokens += tokens
-
-    if current_chunk:
-        chunks.append(current_chunk)
+    # Structure-aware packing: oversized notes are split on Markdown boundaries
+    # instead of being truncated, whole pieces of a split note stay together as
+    # consecutive chunks, and everything else is packed first-fit-decreasing.
+    budget = max_tokens - CHUNK_PIECE_OVERHEAD
+    contents = [item["content"] for item in content_map]
+    token_counts = num_tokens_for_texts(contents, persist=True)
+
+    dedicated = {}  # file position -> chunks made of full pieces of that file
+    items = []      # (position, tokens, [(path, content)], is_tail)
+    for position, (item, content, tokens) in enumerate(zip(content_map, contents, token_counts)):
+        pieces = split_file_into_pieces(content, tokens, budget)
+        if len(pieces) == 1:
+            items.append((position, tokens, [(item["path"], content)], False))
+            continue
+        labelled = [
+            (f"{item['path']} (part {n}/{len(pieces)})", piece, piece_tokens)
+            for n, (piece, piece_tokens) in enumerate(pieces, start=1)
+        ]
+        dedicated[position] = [[(path, piece)] for path, piece, _ in labelled[:-1]]
+        path, piece, piece_tokens = labelled[-1]
+        items.append((position, piece_tokens, [(path, piece)], True))
+
+    # First-fit decreasing; each bin holds at most one tail of a split file so
+    # that tail can sit directly after its file's dedicated chunks.
+    bins = []  # [used_tokens, [(position, entries)], has_tail]
+    for position, tokens, entries, is_tail in sorted(items, key=lambda i: -i[1]):
+        cost = tokens + CHUNK_PIECE_OVERHEAD
+        for b in bins:
+            if b[0] + cost <= max_tokens and not (is_tail and b[2]):
+                b[0] += cost
+                b[1].append((position, entries))
+                b[2] = b[2] or is_tail
+                break
+        else:
+            bins.append([cost, [(position, entries)], is_tail])
+
+    # Emit in case order: bins sorted by their earliest file, split files'
+    # full pieces immediately before the bin carrying their tail (tail first).
+    ordered = []
+    for _, members, _ in bins:
+        tail_positions = [p for p, _ in members if p in dedicated]
+        members.sort(key=lambda m: (m[0] not in dedicated, m[0]))
+        anchor = tail_positions[0] if tail_positions else min(p for p, _ in members)
+        ordered.append((anchor, tail_positions, [entry for _, entries in members for entry in entries]))
+    ordered.sort(key=lambda o: o[0])
 
+    chunks = []
+    for _, tail_positions, chunk in ordered:
+        for position in tail_positions:
+            chunks.extend(dedicated[position])
+        chunks.append(chunk)
     return chunks
 
-def estimate_total_time(chunks, delay=10, per_chunk_estimate=15):
-    total_secs = len(chunks) * (delay + per_chunk_estimate)
+def estimate_total_time(chunks, concurrency=None, per_chunk_estimate=15):
+    # Map waves plus one round per reduce level (each level at least halves the
+    # parts, and even a single chunk gets the final executive-summary merge)
+    concurrency = concurrency or AI_MAX_CONCURRENCY
+    waves = -(-len(chunks) // concurrency)  # ceil division
+    levels = max(1, math.ceil(math.log2(len(chunks)))) if chunks else 0
+    total_secs = (waves + levels) * per_chunk_estimate
     return str(datetime.utcfromtimestamp(total_secs).strftime('%H:%M:%S'))
 
 
-def generate_full_ai_report_from_structure(content_map, case_id):
+def _priorities_prompt(priorities):
+    if not priorities:
+        return ""
+    return (
+        "⚠️ Strategic Priorities for this case:\n"
+        f"{priorities}\n\n"
+        "↳ Always align your analysis with the above goals.\n"
+    )
+
+
+def build_structure_system_prompt(priorities):
+    system_prompt = (
+        "You are an expert investigator building a professional report from case material. "
+        "Prioritize evidence and clarity. Summarize only the most relevant and actionable content.\n\n"
+    )
+    return system_prompt + _priorities_prompt(priorities)
+
+
+def build_reduce_system_prompt(priorities, final):
+    system_prompt = (
+        "You are an expert investigator merging partial findings from the same case into one report. "
+        "Combine overlapping points, remove repetition, keep every concrete identifier "
+        "(addresses, transaction hashes, URLs, handles, dates) and preserve the evidence trail.\n\n"
+    )
+    if final:
+        system_prompt += (
+            "This is the final merge: write the executive summary of the whole case, "
+            "followed by the key findings and recommended next steps.\n\n"
+        )
+    return system_prompt + _priorities_prompt(priorities)
+
+
+def group_for_reduce(parts, max_tokens=None):
+    # Consecutive token-bounded groups of at least two parts, so every level
+    # of the reduce at least halves the number of parts.
+    max_tokens = max_tokens or REDUCE_MAX_TOKENS
+    counts = num_tokens_for_texts(parts)
+    groups, current, current_tokens = [], [], 0
+    for part, tokens in zip(parts, counts):
+        if len(current) >= 2 and current_tokens + tokens > max_tokens:
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append(part)
+        current_tokens += tokens
+    if current:
+        if len(current) == 1 and groups:
+            groups[-1].append(current[0])
+        else:
+            groups.append(current)
+    return groups
+
+
+def run_parallel(func, jobs, desc, max_workers):
+    # Runs func(*job) for every job on a bounded pool; results keep job order.
+    # Failures are returned as exceptions so callers can decide what to keep.
+    from tqdm import tqdm
+    results = [None] * len(jobs)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(func, *job): i for i, job in enumerate(jobs)}
+        with tqdm(total=len(jobs), desc=desc, ncols=80) as progress:
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    results[i] = e
+                progress.update(1)
+    return results
+
+
+def send_chunk(client, system_prompt, chunk, cache=None, on_delta=None):
+    compiled_text = ""
+    for path, content in chunk:
+        compiled_text += f"\n\n---\n📄 Path: {path}\n\n{content}\n"
+    return send_text(client, system_prompt, compiled_text, cache, on_delta)
+
+
+def send_group(client, system_prompt, parts, cache=None, on_delta=None):
+    compiled_text = "\n\n---\n".join(f"### Findings {n}\n\n{part}" for n, part in enumerate(parts, start=1))
+    return send_text(client, system_prompt, compiled_text, cache, on_delta)
+
+
+def send_text(client, system_prompt, compiled_text, cache=None, on_delta=None):
+    return aiClient.chat_completion(
+        client, system_prompt, compiled_text,
+        model="gpt-4", temperature=0.2, cache=cache,
+        token_count=num_tokens_from_string(system_prompt + compiled_text),
+        on_delta=on_delta
+    )
+
+
+def generate_full_ai_report_from_structure(content_map, case_id, max_workers=None, use_cache=True,
+                                           sink=None, stream=False):
+    # Map-reduce: every chunk is summarised in parallel (map), then the
+    # summaries are merged in token-bounded groups, level by level (reduce),
+    # until a single executive summary remains. With a sink the finished
+    # report is written there; with stream=True the final merge is streamed.
+    # Returns (report, failed): failed is True if any request went wrong, in
+    # which case the report carries the error notes and must not be reused.
+    sink = sink or (lambda text: None)
+    sink("# 🧠 AI-GENERATED REPORT\n\n")
     try:
-        client = OpenAI(api_key=get_api_key())
+        client = aiClient.get_client(get_api_key)
         chunks = chunk_content_map(content_map, max_tokens=3000)
+        max_workers = max_workers or AI_MAX_CONCURRENCY
+        cache = AI_CACHE if use_cache else None
 
         # Extract strategic priorities if present
         priorities = next((item["content"] for item in content_map if item.get("is_priority")), None)
+        system_prompt = build_structure_system_prompt(priorities)
 
-        final_report_parts = []
-
-        print(f"🧠 Preparing {len(chunks)} chunks to send to GPT-4...")
-        est_time = estimate_total_time(chunks)
+        print(f"🧠 Preparing {len(chunks)} chunks to send to GPT-4 ({max_workers} at a time)...")
+        est_time = estimate_total_time(chunks, max_workers)
         print(f"⏳ Estimated total time: {est_time} (with {len(chunks)} chunks)\n")
 
-        for i, chunk in enumerate(tqdm(chunks, desc="📡 Sending to GPT-4", ncols=80)):
-            compiled_text = ""
-            for path, content in chunk:
-                compiled_text += f"\n\n---\n📄 Path: {path}\n\n{content}\n"
+        # 🗺️ Map
+        results = run_parallel(
+            send_chunk, [(client, system_prompt, chunk, cache) for chunk in chunks],
+            "📡 Sending to GPT-4", max_workers
+        )
+        errors = [f"_Error in chunk {i+1}: {r}_" for i, r in enumerate(results) if isinstance(r, Exception)]
+        parts = [r for r in results if not isinstance(r, Exception) and r]
+
+        # 🔁 Reduce
+        level = 0
+        streamed = False
+        while parts:
+            level += 1
+            groups = group_for_reduce(parts)
+            final = len(groups) == 1
+            reduce_prompt = build_reduce_system_prompt(priorities, final=final)
+
+            if final and stream:
+                print(f"🧩 Merging {len(parts)} summaries into the executive summary...\n")
+                try:
+                    parts = [send_group(client, reduce_prompt, groups[0], cache, sink)]
+                    streamed = True
+                except Exception as e:
+                    errors.append(f"_Error in merge level {level}: {e}_")
+                break
+
+            results = run_parallel(
+                send_group, [(client, reduce_prompt, group, cache) for group in groups],
+                f"🧩 Merging (level {level})", max_workers
+            )
+            # A failed merge keeps its inputs so nothing is lost
+            next_parts = []
+            for i, (group, r) in enumerate(zip(groups, results)):
+                if isinstance(r, Exception):
+                    errors.append(f"_Error in merge level {level}, group {i+1}: {r}_")
+                    next_parts.extend(group)
+                else:
+                    next_parts.append(r)
+            progressed = len(next_parts) < len(parts)
+            parts = next_parts
+            if final or not progressed:
+                break
 
-            try:
-                system_prompt = (
-                    "You are an expert investigator building a professional report from case material. "
-                    "Prioritize evidence and clarity. Summarize only the most relevant and actionable content.\n\n"
-                )
-                if priorities:
-                    system_prompt += (
-                        "⚠️ Strategic Priorities for this case:\n"
-                        f"{priorities}\n\n"
-                        "↳ Always align your analysis with the above goals.\n"
-                    )
+        body = "\n\n---\n".join(parts)
+        if errors:
+            body += "\n\n---\n" + "\n".join(errors)
+        disclaimer = "\n\n---\n_Disclaimer: This report was generated by AI based on the case file structure and contents._"
 
-                response = client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": system_prompt
-                        },
-                        {
-                            "role": "user",
-                            "content": compiled_text
-                        }
-                    ],
-                    temperature=0.2
-                )
+        if streamed:
+            sink(("\n\n---\n" + "\n".join(errors) if errors else "") + disclaimer)
+        else:
+            sink(body + disclaimer)
+        return "# 🧠 AI-GENERATED REPORT\n\n" + body + disclaimer, bool(errors)
 
-                part = response.choices[0].message.content.strip()
-                final_report_parts.append(part)
+    except Exception as e:
+        sink(f"_AI report generation failed: {e}_")
+        return f"_AI report generation failed: {e}_", True
+
+def load_case_content(case_path, full_tree=True):
+    # 📚 Walk the case once and read each Markdown note once (generated reports
+    # excluded). Returns {rel_path: text} in walk order, shared by the section
+    # report and the AI structure pass. With full_tree=False only the notes
+    # directly inside SUBFOLDERS are read, which is all a traditional report needs.
+    if full_tree:
+        folders = ((root, files) for root, _, files in os.walk(case_path))
+    else:
+        folders = [
+            (os.path.join(case_path, sub), os.listdir(os.path.join(case_path, sub)))
+            for sub in SUBFOLDERS if os.path.isdir(os.path.join(case_path, sub))
+        ]
 
+    content = {}
+    for root, names in folders:
+        for name in names:
+            if not name.endswith(".md") or REPORT_FILE_RE.match(name):
+                continue
+            full_path = os.path.join(root, name)
+            try:
+                with open(full_path, "r") as f:
+                    content[os.path.relpath(full_path, case_path)] = f.read()
             except Exception as e:
-                final_report_parts.append(f"_Error in chunk {i+1}: {e}_")
+                print(f"⚠️ Failed to read {name}: {e}")
+    return content
 
-            time.sleep(10)  # 💤 Cooldown to avoid rate limits
 
-        # Combine all parts
-        full_report = (
-            "# 🧠 AI-GENERATED REPORT\n\n" +
-            "\n\n---\n".join(final_report_parts) +
-            "\n\n---\n_Disclaimer: This report was generated by AI based on the case file structure and contents._"
-        )
+def section_notes(content, sub):
+    # (file name, text) for the notes directly inside one section folder, by name
+    return sorted((os.path.basename(rel_path), text) for rel_path, text in content.items()
+                  if os.path.dirname(rel_path) == sub)
 
-        return full_report
 
-    except Exception as e:
-        return f"_AI report generation failed: {e}_"
+def build_content_map(content):
+    # Strategic Priorities first (flagged for the prompts), then every other
+    # non-empty note in walk order
+    content_map = []
+    priorities = content.get(PRIORITIES_REL_PATH, "").strip()
+    if priorities:
+        content_map.append({
+            "path": "5. Strategic Priorities/5. Strategic Priorities.md",
+            "content": priorities,
+            "is_priority": True  # mark for special treatment
+        })
+    for rel_path, text in content.items():
+        text = text.strip()
+        if rel_path != PRIORITIES_REL_PATH and text:
+            content_map.append({"path": rel_path, "content": text, "is_priority": False})
+    return content_map
+
 
 def collect_case_content(case_path):
-    content_map = []
+    return build_content_map(load_case_content(case_path))
 
-    # First, look for Strategic Priorities
-    priors_path = os.path.join(case_path, "5. Strategic Priorities", "5. Strategic Priorities.md")
-    if os.path.exists(priors_path):
-        with open(priors_path, "r") as f:
-            text = f.read().strip()
-            if text:
-                content_map.append({
-                    "path": "5. Strategic Priorities/5. Strategic Priorities.md",
-                    "content": text,
-                    "is_priority": True  # mark for special treatment
-                })
-
-    # Then collect the rest
-    for root, dirs, files in os.walk(case_path):
-        for file in files:
-            if file.endswith(".md"):
-                full_path = os.path.join(root, file)
-                rel_path = os.path.relpath(full_path, case_path)
-                if rel_path == "5. Strategic Priorities/5. Strategic Priorities.md":
-                    continue  # already added
-                try:
-                    with open(full_path, "r") as f:
-                        text = f.read().strip()
-                        if text:
-                            content_map.append({
-                                "path": rel_path,
-                                "content": text,
-                                "is_priority": False
-                            })
-                except Exception as e:
-                    print(f"⚠️ Failed to read {file}: {e}")
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def load_report_manifest(manifest_path, mode):
+    # Prior run's section hashes and outputs; discarded if the format or mode differs
+    try:
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("mode") != mode:
+        return {}
+    return manifest
+
+
+def save_report_manifest(manifest_path, manifest):
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
 
-    return content_map
 
-def generate_case_report(case_id, use_ai=False):
+def is_failed_output(text):
+    # Section summaries only; the AI structure report returns its own failure flag
+    return text.startswith("_AI summary failed")
+
+
+def generate_case_report(case_id, use_ai=False, use_cache=True, stream=False, prompt=True, on_existing="overwrite",
+                         failures=None):
+    # failures: optional list that collects a note for every AI pass that failed
+    failures = [] if failures is None else failures
+    calls_before, seconds_before = aiClient.call_stats["calls"], aiClient.call_stats["seconds"]
     case_path = os.path.join(BASE_DIR, f"Case_{case_id}")
     notes_file = os.path.join(case_path, "notes.txt")
     report_folder = os.path.join(case_path, "4. Report")
+    if not os.path.exists(notes_file):
+        print(f"❌ Case {case_id} not found.")
+        return None
     os.makedirs(report_folder, exist_ok=True)
     default_filename = f"Case_{case_id}_Report.md"
     md_output_path = os.path.join(report_folder, default_filename)
+    manifest_path = os.path.join(report_folder, f".Case_{case_id}_Report.manifest.json")
 
     # 📌 Check strategic priorities early if using AI
     if use_ai:
@@ -478,102 +929,209 @@ def generate_case_report(case_id, use_ai=False):
                 )
             print("✅ Template created successfully.\n")
 
-        # Prompt user before proceeding
-        print("\n📌 Strategic Priorities Check:")
-        print(f"📄 {strategic_path}")
-        print("➡️  Make sure your strategic goals are up to date and relevant before proceeding.\n")
-        with open(strategic_path, "r") as f:
-            print(Fore.CYAN + f.read())
+        # 📚 Read the case once; the check below, the AI structure pass and the sections all use it
+        content = load_case_content(case_path)
 
-        print(Fore.YELLOW + "\n⚠️  Do you want to update strategic priorities before continuing?")
-        print("1. Yes, open in Obsidian")
-        print("2. No, proceed with AI report generation")
-        print("3. Cancel")
+        # Prompt user before proceeding (scripted runs go straight on)
+        if prompt:
+            print("\n📌 Strategic Priorities Check:")
+            print(f"📄 {strategic_path}")
+            print("➡️  Make sure your strategic goals are up to date and relevant before proceeding.\n")
+            print(Fore.CYAN + content.get(PRIORITIES_REL_PATH, ""))
 
-        choice = input("Enter your choice (1/2/3): ").strip()
-        if choice == "1":
-            try:
-                subprocess.run(["open", "-a", "Obsidian", strategic_path])
-                print("📝 Obsidian opened to Strategic Priorities. Re-run the report when you're ready.")
-            except Exception as e:
-                print(f"⚠️ Failed to open Obsidian: {e}")
-            return
-        elif choice == "2":
-            print("✅ Proceeding with AI report generation...\n")
-        elif choice == "3":
-            print("❌ Cancelled by user.")
-            return
-        else:
-            print("❌ Invalid selection. Cancelling.")
-            return
+            print(Fore.YELLOW + "\n⚠️  Do you want to update strategic priorities before continuing?")
+            print("1. Yes, open in Obsidian")
+            print("2. No, proceed with AI report generation")
+            print("3. Cancel")
+
+            choice = input("Enter your choice (1/2/3): ").strip()
+            if choice == "1":
+                try:
+                    subprocess.run(["open", "-a", "Obsidian", strategic_path])
+                    print("📝 Obsidian opened to Strategic Priorities. Re-run the report when you're ready.")
+                except Exception as e:
+                    print(f"⚠️ Failed to open Obsidian: {e}")
+                return
+            elif choice == "2":
+                print("✅ Proceeding with AI report generation...\n")
+            elif choice == "3":
+                print("❌ Cancelled by user.")
+                return
+            else:
+                print("❌ Invalid selection. Cancelling.")
+                return
 
     # 🧾 Handle existing report
     if os.path.exists(md_output_path):
         print(f"⚠️ A report already exists for Case {case_id}: {default_filename}")
-        choice = input("Do you want to overwrite (o) or save as a new version (n)? [o/n]: ").strip().lower()
+        if prompt:
+            choice = input("Do you want to overwrite (o) or save as a new version (n)? [o/n]: ").strip().lower()
+        else:
+            choice = "n" if on_existing == "version" else "o"
         if choice == "n":
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             md_output_path = os.path.join(report_folder, f"Case_{case_id}_Report_{timestamp}.md")
         elif choice != "o":
             print("❌ Invalid input. Cancelling report generation.")
-            return
+            return None
+
+    if not use_ai:
+        content = load_case_content(case_path, full_tree=False)
 
     # 📄 Begin building the report content
-    report_md = f"# 🕵️‍♂️ INVESTIGATION REPORT: Case {case_id}\n"
-    report_md += f"**Date Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
-    report_md += "**Generated by**: Investigation Case Manager (Automated System)\n\n---\n"
+    header = f"# 🕵️‍♂️ INVESTIGATION REPORT: Case {case_id}\n"
+    header += f"**Date Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
+    header += "**Generated by**: Investigation Case Manager (Automated System)\n\n---\n"
 
     # 📋 Include case notes
+    notes_block = ""
     if os.path.exists(notes_file):
         with open(notes_file, "r") as f:
             notes = f.read()
-            report_md += "## 📋 Case Notes (from notes.txt)\n"
-            report_md += f"```\n{notes.strip()}\n```\n\n---\n"
-
-    # 📦 Add each folder's content
-    print("\n⏳ Generating report. Please wait...\n")
-    all_section_text = ""
-    for sub in tqdm(SUBFOLDERS, desc="📊 Building Sections", ncols=80):
-        time.sleep(0.1)
-        sub_path = os.path.join(case_path, sub)
-        md_files = [f for f in os.listdir(sub_path) if f.endswith(".md")] if os.path.exists(sub_path) else []
-
-        full_text = ""
-        for md_file in md_files:
-            with open(os.path.join(sub_path, md_file), "r") as f:
-                full_text += f.read().strip() + "\n\n"
-
-        if full_text.strip():
-            summary = generate_summary_for_section(sub, full_text, use_ai=use_ai)
-            report_md += f"## {sub}\n"
-            report_md += f"**Summary**:\n{summary}\n\n"
-            report_md += "**Details**:\n"
-            report_md += f"```\n{full_text.strip()}\n```\n\n---\n"
+            notes_block += "## 📋 Case Notes (from notes.txt)\n"
+            notes_block += f"```\n{notes.strip()}\n```\n\n---\n"
+
+    mode = "ai" if use_ai else "traditional"
+    # use_cache=False regenerates everything; the fresh manifest is still saved below
+    previous = load_report_manifest(manifest_path, mode) if use_cache else {}
+    previous_sections = previous.get("sections", {})
+    manifest = {"version": MANIFEST_VERSION, "mode": mode, "sections": {}}
+    reused = 0
+
+    # 💾 The report is appended to a .partial file as it is produced and only
+    # replaces the real report once complete, so a crash mid-run keeps
+    # everything generated so far. With stream=True AI output is echoed live.
+    partial_path = md_output_path + ".partial"
+    report_file = open(partial_path, "w")
+
+    def write(text):
+        report_file.write(text)
+        report_file.flush()
+
+    def echo(text):
+        write(text)
+        print(text, end="", flush=True)
+
+    emit = echo if stream else write
+
+    try:
+        # 🤖 The AI structure report leads the document, so it is produced first
+        # and only recomputed when the case content changed
+        if use_ai:
+            print("🧠 Mapping and reasoning through all folders...")
+            content_map = build_content_map(content)
+            structure_hash = content_hash(json.dumps(content_map, sort_keys=True))
+            prior = previous.get("ai_report", {})
+            write("# 🧠 AI-GENERATED REPORT\n\n")
+            if prior.get("hash") == structure_hash and "content" in prior:
+                print("♻️ Case content unchanged since the last AI report; reusing it.")
+                ai_report, ai_failed = prior["content"], False
+                emit(ai_report)
+            else:
+                ai_report, ai_failed = generate_full_ai_report_from_structure(
+                    content_map, case_id, use_cache=use_cache, sink=emit, stream=stream
+                )
+            if ai_failed:
+                failures.append("AI structure report: failed requests are noted in the report")
+            else:
+                manifest["ai_report"] = {"hash": structure_hash, "content": ai_report}
+            write("\n\n---\n")
+            write(header)
+            write(notes_block)
+            if stream:
+                print()
+
+        # 📦 Add each folder's content, reusing prior summaries for untouched sections.
+        # Traditional sections are held back because the overview goes above them.
+        from tqdm import tqdm
+        print("\n⏳ Generating report. Please wait...\n")
+        all_section_text = ""
+        section_blocks = []
+        for sub in tqdm(SUBFOLDERS, desc="📊 Building Sections", ncols=80, disable=stream):
+            full_text = ""
+            file_hashes = {}
+            for md_file, text in section_notes(content, sub):
+                file_hashes[md_file] = content_hash(text)
+                full_text += text.strip() + "\n\n"
+
+            if not full_text.strip():
+                continue
+
+            section_hash = content_hash(full_text)
+            prior = previous_sections.get(sub, {})
+            details = f"\n\n**Details**:\n```\n{full_text.strip()}\n```\n\n---\n"
+
+            if use_ai:
+                emit(f"## {sub}\n**Summary**:\n")
+                if prior.get("hash") == section_hash and "summary" in prior:
+                    summary = prior["summary"]
+                    reused += 1
+                    emit(summary)
+                elif stream:
+                    summary = generate_summary_for_section(
+                        sub, full_text, use_ai=True, use_cache=use_cache, on_delta=echo
+                    )
+                    if is_failed_output(summary):
+                        echo(summary)
+                else:
+                    summary = generate_summary_for_section(sub, full_text, use_ai=True, use_cache=use_cache)
+                    write(summary)
+                write(details)
+                if stream:
+                    print("\n")
+            else:
+                if prior.get("hash") == section_hash and "summary" in prior:
+                    summary = prior["summary"]
+                    reused += 1
+                else:
+                    summary = generate_summary_for_section(sub, full_text, use_ai=False)
+                section_blocks.append(f"## {sub}\n**Summary**:\n{summary}{details}")
+
+            if is_failed_output(summary):
+                failures.append(f"{sub}: {summary.strip('_')}")
+            else:
+                manifest["sections"][sub] = {"hash": section_hash, "files": file_hashes, "summary": summary}
             all_section_text += full_text + "\n"
 
-    # 🤖 Final case summary via AI or fallback
-    if use_ai:
-        print("🧠 Mapping and reasoning through all folders...")
-        content_map = collect_case_content(case_path)
-        ai_report = generate_full_ai_report_from_structure(content_map, case_id)
-        report_md = f"# 🧠 AI-GENERATED REPORT\n\n{ai_report}\n\n---\n" + report_md
-    else:
-        case_summary = generate_summary_for_section("Case Overview", all_section_text.strip(), use_ai=False)
-        report_md = report_md.replace("## 📋", "## 📝 Summary\n" + case_summary + "\n\n---\n## 📋")
+        if reused:
+            print(f"♻️ Reused {reused} unchanged section summar{'ies' if reused != 1 else 'y'} from the previous report.")
 
-    # 🚨 Add disclaimer
-    report_md += "## 🛑 Disclaimer\n"
-    report_md += "This report was generated automatically using investigative data provided by the user. "
-    report_md += "All content should be verified for accuracy before official submission.\n"
+        # 📝 Traditional overview — only recomputed when its inputs changed
+        if not use_ai:
+            overview_hash = content_hash(all_section_text.strip())
+            prior = previous.get("overview", {})
+            if prior.get("hash") == overview_hash and "summary" in prior:
+                case_summary = prior["summary"]
+            else:
+                case_summary = generate_summary_for_section("Case Overview", all_section_text.strip(), use_ai=False)
+            manifest["overview"] = {"hash": overview_hash, "summary": case_summary}
+            write(header)
+            write("## 📝 Summary\n" + case_summary + "\n\n---\n")
+            write(notes_block)
+            for block in section_blocks:
+                write(block)
+
+        # 🚨 Add disclaimer
+        write("## 🛑 Disclaimer\n")
+        write("This report was generated automatically using investigative data provided by the user. ")
+        write("All content should be verified for accuracy before official submission.\n")
+    finally:
+        report_file.close()
 
     # 💾 Save the report
-    with open(md_output_path, "w") as f:
-        f.write(report_md)
+    os.replace(partial_path, md_output_path)
+    save_report_manifest(manifest_path, manifest)
 
     print(f"\n✅ Report generated successfully:")
     print(f"📄 {md_output_path}")
-
-def generate_summary_for_section(section_name, text, use_ai=False):
+    # Only this report's calls; call_stats counts for the whole process
+    calls = aiClient.call_stats["calls"] - calls_before
+    if use_ai and calls:
+        latency = (aiClient.call_stats["seconds"] - seconds_before) / calls
+        print(f"📶 {calls} AI calls, average latency {latency:.2f}s")
+    return md_output_path
+
+def generate_summary_for_section(section_name, text, use_ai=False, use_cache=True, on_delta=None):
     if not text.strip():
         return "_No content available._"
 
@@ -591,25 +1149,65 @@ def generate_summary_for_section(section_name, text, use_ai=False):
         return "\n".join(bullet_points) if bullet_points else "_No summary available._"
 
     try:
-        client = OpenAI(api_key=get_api_key())
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": (
-                    "You are an AI assistant helping generate a formal investigation report for law enforcement. "
-                    f"Summarize this section: '{section_name}' with professionalism and clarity. "
-                    "Use bullet points or a short summary paragraph. Avoid speculation."
-                )},
-                {"role": "user", "content": text}
-            ],
-            temperature=0.3
+        client = aiClient.get_client(get_api_key)
+        system_prompt = (
+            "You are an AI assistant helping generate a formal investigation report for law enforcement. "
+            f"Summarize this section: '{section_name}' with professionalism and clarity. "
+            "Use bullet points or a short summary paragraph. Avoid speculation."
+        )
+        return aiClient.chat_completion(
+            client, system_prompt, text,
+            model="gpt-4", temperature=0.3, cache=AI_CACHE if use_cache else None,
+            token_count=num_tokens_from_string(system_prompt + text),
+            on_delta=on_delta
         )
-        return response.choices[0].message.content.strip()
     except Exception as e:
         return f"_AI summary failed: {e}_"
 
+def batch_generate_reports():
+    # 📦 Month-end run: a report for every case matching a filter, no per-case prompts
+    print("\n📦 Which cases should get a report?")
+    filters = ask_case_filters()
+    case_ids = caseBatch.select_cases(BASE_DIR, **filters)
+    if not case_ids:
+        print("📁 No cases match these filters." if caseIndex.has_filters(filters) else "📁 No cases found.")
+        return
+
+    print("\n📝 How would you like to generate the reports?")
+    print("1. Traditional method (no AI)")
+    print("2. Use ChatGPT (AI-powered summaries)")
+    method_choice = input("Enter choice (1 or 2): ").strip()
+    if method_choice not in ("1", "2"):
+        print("❌ Invalid choice.")
+        return
+    use_ai = method_choice == "2"
+    if use_ai and not get_api_key():
+        print("\n⚠️ No OpenAI API key found. Set one with option 8 first.")
+        return
+
+    existing = input("Existing reports: overwrite (o) or keep them and save new versions (n)? [o/n]: ").strip().lower()
+    on_existing = "version" if existing == "n" else "overwrite"
+    if input(f"Generate {len(case_ids)} report(s)? (y/n): ").strip().lower() != "y":
+        print("❌ Cancelled.")
+        return
+
+    print(f"\n⏳ Generating {len(case_ids)} report(s)...\n")
+    summary = caseBatch.run_batch(sys.modules[__name__], case_ids, use_ai=use_ai, on_existing=on_existing,
+                                  progress=caseBatch.print_progress)
+
+    table = []
+    for r in summary["results"]:
+        outcome = os.path.basename(r["path"]) if r["ok"] else r["error"]
+        table.append([r["case_id"], "✅" if r["ok"] else "❌", f"{r['seconds']:.2f}s", outcome])
+    print(tabulate(table, headers=["Case ID", "OK", "Time", "Report / Error"], tablefmt="fancy_grid"))
+    print(f"📊 {summary['succeeded']} succeeded, {summary['failed']} failed in "
+          f"{summary['wall_seconds']:.1f}s ({summary['workers']} worker{'s' if summary['workers'] != 1 else ''})")
+    print(f"🧾 Run summary saved to {summary['summary_path']}")
+
 def menu():
     os.makedirs(BASE_DIR, exist_ok=True)
+    caseIndex.ensure_index(BASE_DIR)
+    caseIndex.reconcile(BASE_DIR)  # pick up edits made outside the tool (e.g. in Obsidian)
     while True:
         print("\n📂 Investigation Case Manager")
         print(tabulate([
@@ -621,6 +1219,9 @@ def menu():
             ["6", "Generate Case Report"],
             ["7", "Open Case in Obsidian"],
             ["8", "Manage API Key"],
+            ["9", "Search Cases"],
+            ["10", "Indicator Lookup"],
+            ["11", "Batch Generate Reports"],
             ["99", "Exit"]
         ], headers=["Option", "Action"], tablefmt="grid"))
 
@@ -668,7 +1269,7 @@ def menu():
 
 
         elif choice == "2":
-            list_cases()
+            browse_cases()
         elif choice == "3":
             case_id = select_case()
             if case_id:
@@ -676,6 +1277,8 @@ def menu():
         elif choice == "4":
             case_id = select_case()
             if case_id:
+                # Remember what we saw, so a concurrent edit isn't silently overwritten
+                version = caseMeta.read_revision(os.path.join(BASE_DIR, f"Case_{case_id}"))
                 # Select new case status
                 print("Select new case status:")
                 print("1. Open")
@@ -703,7 +1306,7 @@ def menu():
                     print("❌ Invalid payment status selection.")
                     return
 
-                update_status_and_payment(case_id, new_status, new_payment_status)
+                update_status_and_payment(case_id, new_status, new_payment_status, expected_version=version)
 
 
         elif choice == "5":
@@ -733,7 +1336,9 @@ def menu():
                     print('   export OPENAI_API_KEY="sk-..."')
                     print("4. Restart this script after setting the key.\n")
                 else:
-                    generate_case_report(case_id, use_ai=True)
+                    reuse = input("♻️ Reuse cached AI responses for unchanged content? (y/n): ").strip().lower()
+                    live = input("📡 Stream AI output live as it is written? (y/n): ").strip().lower()
+                    generate_case_report(case_id, use_ai=True, use_cache=(reuse != "n"), stream=(live == "y"))
             else:
                 print("❌ Invalid choice.")
 
@@ -744,6 +1349,12 @@ def menu():
                 open_case_in_obsidian(case_id)
         elif choice == "8":
             manage_api_key()
+        elif choice == "9":
+            search_cases()
+        elif choice == "10":
+            lookup_indicator()
+        elif choice == "11":
+            batch_generate_reports()
 
         elif choice == "99":
             print("👋 Exiting.")
@@ -752,4 +1363,8 @@ def menu():
             print("❓ Invalid choice. Try again.")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Subcommands (create/list/show/update/delete/report) run without prompts
+        import caseCli
+        sys.exit(caseCli.run(sys.modules[__name__], sys.argv[1:]))
     menu()
@@ -0,0 +1,344 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Starting budget only: the limiter adopts the account's real limits from the
+# x-ratelimit-* headers of the first response. Setting either variable pins
+# that limit instead (e.g. to leave room for other tools on the same key).
+AI_REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+AI_TOKENS_PER_MINUTE = int(os.getenv("OPENAI_TPM_LIMIT", "10000"))
+LEARN_REQUEST_LIMIT = "OPENAI_RPM_LIMIT" not in os.environ
+LEARN_TOKEN_LIMIT = "OPENAI_TPM_LIMIT" not in os.environ
+MAX_LIMITER_WAIT = 1.0  # seconds per sleep in acquire(), so newly learned limits apply promptly
+AI_MAX_RETRIES = 5
+AI_COMPLETION_TOKEN_ESTIMATE = 800  # reserved per call for the model's reply
+DEFAULT_RETRY_AFTER = 5.0
+TRANSIENT_RETRY_BASE = 1.0  # seconds before the first retry of a dropped connection or 5xx; doubles each time
+AI_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Connection pool shared by every request the process makes
+AI_MAX_CONNECTIONS = 16
+AI_KEEPALIVE_CONNECTIONS = 8
+AI_KEEPALIVE_EXPIRY = 120  # seconds an idle connection is kept open
+AI_REQUEST_TIMEOUT = 120
+AI_CONNECT_TIMEOUT = 10
+
+
+class RateLimiter:
+    # Two token buckets (requests/min and tokens/min) that refill continuously.
+    # acquire() only blocks when a call would overdraw one of them; a 429 from
+    # the API pauses every caller until the server's retry-after has passed.
+    # learn() keeps both buckets in line with the server's rate-limit headers.
+
+    def __init__(self, requests_per_minute=AI_REQUESTS_PER_MINUTE, tokens_per_minute=AI_TOKENS_PER_MINUTE,
+                 learn_requests=LEARN_REQUEST_LIMIT, learn_tokens=LEARN_TOKEN_LIMIT):
+        self.request_capacity = float(requests_per_minute)
+        self.token_capacity = float(tokens_per_minute)
+        self.request_budget = self.request_capacity
+        self.token_budget = self.token_capacity
+        self.learn_requests = learn_requests
+        self.learn_tokens = learn_tokens
+        self.blocked_until = 0.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated
+        self.updated = now
+        self.request_budget = min(self.request_capacity, self.request_budget + elapsed * self.request_capacity / 60)
+        self.token_budget = min(self.token_capacity, self.token_budget + elapsed * self.token_capacity / 60)
+
+    def acquire(self, tokens):
+        # A single call larger than the whole budget waits for a full bucket
+        tokens = min(float(tokens), self.token_capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.request_budget >= 1 and self.token_budget >= tokens:
+                    self.request_budget -= 1
+                    self.token_budget -= tokens
+                    return
+                else:
+                    wait = max(
+                        (1 - self.request_budget) * 60 / self.request_capacity,
+                        (tokens - self.token_budget) * 60 / self.token_capacity,
+                    )
+            time.sleep(min(max(wait, 0.01), MAX_LIMITER_WAIT))
+
+    def learn(self, headers):
+        # x-ratelimit-limit-* replaces a capacity that was not pinned by the
+        # environment (growth is usable at once); x-ratelimit-remaining-* caps
+        # the budget, since the server also counts other users of the key.
+        requests_limit = _header_number(headers, "x-ratelimit-limit-requests")
+        requests_left = _header_number(headers, "x-ratelimit-remaining-requests")
+        tokens_limit = _header_number(headers, "x-ratelimit-limit-tokens")
+        tokens_left = _header_number(headers, "x-ratelimit-remaining-tokens")
+        with self.lock:
+            self._refill(time.monotonic())
+            if self.learn_requests and requests_limit:
+                self.request_budget += requests_limit - self.request_capacity
+                self.request_capacity = requests_limit
+            if self.learn_tokens and tokens_limit:
+                self.token_budget += tokens_limit - self.token_capacity
+                self.token_capacity = tokens_limit
+            if requests_left is not None:
+                self.request_budget = min(self.request_budget, requests_left)
+            if tokens_left is not None:
+                self.token_budget = min(self.token_budget, tokens_left)
+
+    def penalize(self, retry_after):
+        # Called on a 429: stop everyone and drain the buckets so we restart gently
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+            self.request_budget = 0.0
+            self.token_budget = 0.0
+
+
+def _header_number(headers, name):
+    try:
+        value = headers.get(name)
+        return float(value) if value not in (None, "") else None
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+_client = None
+_client_lock = threading.Lock()
+
+# Wall-clock latency of completed API calls (cache hits excluded)
+call_stats = {"calls": 0, "seconds": 0.0}
+_stats_lock = threading.Lock()
+
+
+def get_client(api_key_provider):
+    # One OpenAI client per process, built on first use. The key provider
+    # (which reads .env) is only consulted then, and the underlying httpx
+    # pool keeps TLS connections alive between section and chunk calls.
+    global _client
+    with _client_lock:
+        if _client is None:
+            import httpx
+            from openai import OpenAI
+
+            http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=AI_MAX_CONNECTIONS,
+                    max_keepalive_connections=AI_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=AI_KEEPALIVE_EXPIRY,
+                ),
+                timeout=httpx.Timeout(AI_REQUEST_TIMEOUT, connect=AI_CONNECT_TIMEOUT),
+            )
+            # max_retries=0: the SDK would otherwise retry 429s itself, hiding
+            # them from call_with_rate_limit and doubling the backoff
+            _client = OpenAI(api_key=api_key_provider(), http_client=http_client, max_retries=0)
+        return _client
+
+
+def reset_client():
+    # Drop the shared client, e.g. after the API key changes
+    global _client
+    with _client_lock:
+        if _client is not None:
+            try:
+                _client.close()
+            except Exception:
+                pass
+        _client = None
+
+
+def record_call(seconds):
+    with _stats_lock:
+        call_stats["calls"] += 1
+        call_stats["seconds"] += seconds
+
+
+def average_latency():
+    with _stats_lock:
+        return call_stats["seconds"] / call_stats["calls"] if call_stats["calls"] else 0.0
+
+
+def get_rate_limiter():
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
+
+
+def retry_after_seconds(error):
+    # Read the server's hint off a 429 response, falling back to a fixed pause
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return DEFAULT_RETRY_AFTER
+
+
+def is_rate_limit_error(error):
+    return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def is_transient_error(error):
+    # What the SDK used to retry on its own besides 429s: timeouts, dropped connections, 5xx
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in (408, 409) or status >= 500
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+def call_with_rate_limit(request, tokens, limiter=None, max_retries=AI_MAX_RETRIES):
+    # Run request() once the limiter has room for `tokens`. This is the only
+    # retry loop (the shared client has SDK retries off): 429s pause every
+    # caller via the limiter, transient failures back off just this caller.
+    limiter = limiter or get_rate_limiter()
+    for attempt in range(max_retries + 1):
+        limiter.acquire(tokens)
+        try:
+            return request()
+        except Exception as e:
+            if attempt == max_retries:
+                raise
+            if is_rate_limit_error(e):
+                limiter.learn(getattr(getattr(e, "response", None), "headers", None) or {})
+                limiter.penalize(retry_after_seconds(e))
+            elif is_transient_error(e):
+                time.sleep(TRANSIENT_RETRY_BASE * 2 ** attempt)
+            else:
+                raise
+
+
+class ResponseCache:
+    # Content-addressed store for completions: one JSON file per request hash,
+    # fanned out into two-character subfolders. File mtime doubles as the LRU
+    # clock — hits touch the file, eviction removes the oldest first.
+
+    def __init__(self, cache_dir, max_bytes=AI_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.total_bytes = None
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model, temperature, system_prompt, user_content):
+        payload = json.dumps([model, temperature, system_prompt, user_content], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                text = json.load(f)["content"]
+            os.utime(path)
+            return text
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key, text):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"content": text, "created": time.time()}, f)
+        os.replace(tmp_path, path)
+        with self.lock:
+            if self.total_bytes is None:
+                self.total_bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self.total_bytes += os.path.getsize(path)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for bucket in os.scandir(self.cache_dir):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.endswith(".json"):
+                    st = entry.stat()
+                    entries.append((entry.path, st.st_size, st.st_mtime_ns))
+        return entries
+
+    def _evict(self):
+        # Drop least recently used entries until we are back under 90% of the cap
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self.total_bytes = total
+
+
+def chat_completion(client, system_prompt, user_content, model="gpt-4", temperature=0.2,
+                    cache=None, token_count=None, on_delta=None):
+    # Single entry point for the report pipeline: cache lookup, then a
+    # rate-limited API call whose result is stored for next time. With
+    # on_delta the response is streamed and each text fragment is passed on
+    # as it arrives (a cache hit is delivered as one fragment).
+    key = None
+    if cache is not None:
+        key = ResponseCache.make_key(model, temperature, system_prompt, user_content)
+        cached = cache.get(key)
+        if cached is not None:
+            if on_delta:
+                on_delta(cached)
+            return cached
+
+    tokens = (token_count or 0) + AI_COMPLETION_TOKEN_ESTIMATE
+    limiter = get_rate_limiter()
+
+    def request():
+        # Raw response first, so the limiter sees the rate-limit headers
+        raw = client.chat.completions.with_raw_response.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_content}
+            ],
+            temperature=temperature,
+            stream=on_delta is not None
+        )
+        limiter.learn(raw.headers)
+        return raw.parse()
+
+    started = time.perf_counter()
+    response = call_with_rate_limit(request, tokens, limiter)
+
+    if on_delta is None:
+        text = response.choices[0].message.content.strip()
+    else:
+        parts = []
+        for event in response:
+            delta = event.choices[0].delta.content if event.choices else None
+            if delta:
+                parts.append(delta)
+                on_delta(delta)
+        text = "".join(parts).strip()
+    record_call(time.perf_counter() - started)
+
+    if cache is not None:
+        cache.put(key, text)
+    return text
@@ -0,0 +1,118 @@
+"""End-to-end benchmark of the AI report path, fully offline.
+
+Builds a throwaway ~/Investigations under a temp HOME, starts the mock LLM
+server, points the OpenAI client at it and runs
+generate_case_report(use_ai=True). Records wall time, request count, tokens
+sent/received, 429s and peak memory for each run.
+
+    python benchmarks/benchAIReport.py --sections-files 6 --note-kb 12 --latency 0.3 --output ai_bench.json
+"""
+import argparse
+import builtins
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from mockLLMServer import MockState, start_server  # noqa: E402
+from syntheticCases import build_case  # noqa: E402
+
+# ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+RSS_DIVISOR = 1024 * 1024 if sys.platform == "darwin" else 1024
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark generate_case_report(use_ai=True) against a mock LLM")
+    parser.add_argument("--sections-files", type=int, default=4, help="markdown files per section folder")
+    parser.add_argument("--note-kb", type=int, default=8, help="approximate size of each note")
+    parser.add_argument("--runs", type=int, default=2, help="later runs exercise the manifest/cache reuse")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the AI response cache")
+    parser.add_argument("--stream", action="store_true", help="use streamed completions")
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--tokens-per-second", type=float, default=0)
+    parser.add_argument("--completion-tokens", type=int, default=150)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--rpm", type=int, default=10000, help="client-side requests/min budget")
+    parser.add_argument("--tpm", type=int, default=10_000_000, help="client-side tokens/min budget")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp(prefix="ioc-ai-bench-")
+    state = MockState(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    server, base_url = start_server(state)
+
+    # Everything the case manager reads at import time must be set first
+    os.environ["HOME"] = home
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["OPENAI_API_KEY"] = "sk-mock-benchmark-key"
+    os.environ["OPENAI_RPM_LIMIT"] = str(args.rpm)
+    os.environ["OPENAI_TPM_LIMIT"] = str(args.tpm)
+
+    import advanceCaseManager as acm
+    import aiClient
+
+    case_id = "BENCH"
+    build_case(acm.BASE_DIR, case_id, acm.SUBFOLDERS, args.sections_files, args.note_kb, args.seed)
+
+    # Answer the interactive prompts: proceed past Strategic Priorities, overwrite reports
+    builtins.input = lambda prompt="": "2" if "1/2/3" in prompt else "o"
+
+    runs = []
+    for run in range(args.runs):
+        state.reset()
+        calls_before = aiClient.call_stats["calls"]
+        tracemalloc.start()
+        started = time.perf_counter()
+        acm.generate_case_report(case_id, use_ai=True, use_cache=not args.no_cache, stream=args.stream)
+        wall = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stats = state.snapshot()
+        runs.append({
+            "run": run + 1,
+            "wall_seconds": round(wall, 3),
+            "requests": stats["requests"],
+            "completed_requests": stats["completed"],
+            "rate_limited": stats["rate_limited"],
+            "max_in_flight": stats["max_in_flight"],
+            "prompt_tokens_sent": stats["prompt_tokens"],
+            "completion_tokens_received": stats["completion_tokens"],
+            "client_calls": aiClient.call_stats["calls"] - calls_before,
+            "peak_python_heap_mb": round(peak / 1024 / 1024, 2),
+        })
+
+    results = {
+        "benchmark": "ai_report",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / RSS_DIVISOR, 2),
+        "runs": runs,
+    }
+    server.shutdown()
+
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload + "\n")
+        print(f"\n📊 Results written to {args.output}")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
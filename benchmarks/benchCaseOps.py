@@ -0,0 +1,177 @@
+"""Scaling benchmark for the everyday case operations.
+
+Generates synthetic Investigations trees (see syntheticCases.py) under a
+temporary HOME and times, without any prompts:
+
+  index_build     first caseIndex build (cases, search postings, indicators)
+  reconcile       a no-change reconcile, as run at every menu start
+  list_cases      first page of the listing, rendered and discarded
+  list_filtered   open cases matching a description term, newest first, last page
+  browse_cases    opening the interactive listing and leaving it
+  select_case     the case picker run before view/update/delete/report, picking case 1
+  view_case       folder summary plus a paged deep dive of a sample of cases
+  collect_content collect_case_content() for the same sample (advanceCaseManager only)
+  report          traditional generate_case_report() for the same sample
+  search          a two-term full-text search
+  indicator       lookup of an indicator shared across cases
+
+Results for each tree size are written as JSON so runs can be compared.
+
+    python benchmarks/benchCaseOps.py --cases 10 1000 10000 --note-kb 2 --output ops_bench.json
+"""
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import syntheticCases  # noqa: E402
+
+# ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+RSS_DIVISOR = 1024 * 1024 if sys.platform == "darwin" else 1024
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "total_ms": round(sum(samples) * 1000, 3),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "min_ms": round(samples[0] * 1000, 3),
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 3),
+        "max_ms": round(samples[-1] * 1000, 3),
+    }
+
+
+def timed(func, *args):
+    # Runs func with all terminal output (including tqdm on stderr) discarded
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        started = time.perf_counter()
+        func(*args)
+        return time.perf_counter() - started
+
+
+def answering(answer, func):
+    # func with every listing prompt answered by `answer`; other prompts as usual
+    def run():
+        real_input = builtins.input
+        builtins.input = lambda prompt="": answer if "Enter to go back" in prompt else real_input(prompt)
+        try:
+            func()
+        finally:
+            builtins.input = real_input
+    return run
+
+
+def run_size(manager, base_dir, count, args):
+    import caseIndex
+    import caseSearch
+    import caseIndicators
+
+    started = time.perf_counter()
+    ids = syntheticCases.generate_tree(base_dir, count, args.files_per_section, args.note_kb,
+                                       args.seed, args.indicator_rate, manager.SUBFOLDERS)
+    generate_seconds = time.perf_counter() - started
+
+    manager.BASE_DIR = base_dir
+    sample = random.Random(args.seed).sample(ids, min(args.sample, len(ids)))
+    shared = syntheticCases.make_shared_pool(args.seed)[0]
+    ops = {}
+
+    ops["index_build"] = summarize([timed(caseIndex.ensure_index, base_dir)])
+    ops["reconcile"] = summarize([timed(caseIndex.reconcile, base_dir) for _ in range(args.repeat)])
+    ops["list_cases"] = summarize([timed(manager.list_cases) for _ in range(args.repeat)])
+    _, matching = caseIndex.query_cases(base_dir, status="Open", text="case")
+    last_page = max(1, -(-matching // manager.CASES_PER_PAGE))
+    ops["list_filtered"] = summarize([
+        timed(lambda: manager.list_cases(page=last_page, status="Open", text="case", sort="created", descending=True))
+        for _ in range(args.repeat)
+    ])
+    ops["browse_cases"] = summarize([timed(answering("", manager.browse_cases)) for _ in range(args.repeat)])
+    ops["select_case"] = summarize([timed(answering("1", manager.select_case)) for _ in range(args.repeat)])
+    ops["view_case"] = summarize([timed(manager.view_case, case_id) for case_id in sample])
+    if hasattr(manager, "collect_case_content"):
+        ops["collect_content"] = summarize([
+            timed(manager.collect_case_content, os.path.join(base_dir, f"Case_{case_id}"))
+            for case_id in sample
+        ])
+    ops["report"] = summarize([timed(manager.generate_case_report, case_id) for case_id in sample])
+    ops["search"] = summarize([timed(caseSearch.search, base_dir, "wallet transfer") for _ in range(args.repeat)])
+    ops["indicator"] = summarize([timed(caseIndicators.lookup, base_dir, shared) for _ in range(args.repeat)])
+
+    return {
+        "cases": count,
+        "generate_seconds": round(generate_seconds, 3),
+        "sampled_cases": len(sample),
+        "operations": ops,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time case operations against synthetic Investigations trees")
+    parser.add_argument("--cases", type=int, nargs="+", default=[10, 1000], help="tree sizes to benchmark (10 to 100000)")
+    parser.add_argument("--files-per-section", type=int, default=1)
+    parser.add_argument("--note-kb", type=float, default=2)
+    parser.add_argument("--indicator-rate", type=float, default=0.1)
+    parser.add_argument("--sample", type=int, default=10, help="cases used for view/collect/report timings")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions for whole-tree operations")
+    parser.add_argument("--module", choices=["caseManager", "advanceCaseManager"], default="advanceCaseManager")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep", action="store_true", help="leave the generated trees on disk")
+    parser.add_argument("--output", help="write JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp(prefix="ioc-ops-bench-")
+    os.environ["HOME"] = home  # the managers resolve ~/Investigations at import time
+
+    import importlib
+    manager = importlib.import_module(args.module)
+
+    # "y" to the deep dive, "n"ext through every page of it, "o"verwrite reports
+    builtins.input = lambda prompt="": "y" if "(y/n)" in prompt else "n" if "[q]uit" in prompt else "o"
+
+    results = {
+        "benchmark": "case_operations",
+        "module": args.module,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": vars(args),
+        "home": home,
+        "sizes": [],
+    }
+    for count in args.cases:
+        base_dir = os.path.join(home, f"Investigations_{count}")
+        print(f"⏳ Benchmarking {count} cases...", file=sys.stderr)
+        results["sizes"].append(run_size(manager, base_dir, count, args))
+    results["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / RSS_DIVISOR, 2)
+
+    if not args.keep:
+        import shutil
+        shutil.rmtree(home, ignore_errors=True)
+
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload + "\n")
+        print(f"\n📊 Results written to {args.output}")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Concurrent case metadata update stress test.
+
+Starts --processes workers that each perform --updates read-modify-writes of
+the same case. For the locked/atomic path (caseMeta.update_case) worker k
+moves its own tag "wk-n" up by one each time, so at the end the revision must
+equal the total number of updates and every writer's last tag must be there.
+With --baseline, the previous truncate-and-rewrite of notes.txt runs too;
+there worker k counts up the field "Writer k" instead. A lost update or a torn
+file shows up as a wrong count or missing lines.
+
+    python benchmarks/benchNotesUpdates.py --processes 8 --updates 200 --baseline --output notes_bench.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import caseMeta  # noqa: E402
+
+BASE_FIELDS = ["Case ID: STRESS", "Status: Open", "Description: Concurrency test: many writers",
+               "Payment Status: Not Paid", "Created: 2024-01-01 00:00:00"]
+
+
+def unsafe_update(notes_file, fields):
+    # The original approach: read notes.txt, then truncate and rewrite in place
+    with open(notes_file, "r") as f:
+        lines = f.readlines()
+    pending = dict(fields)
+    with open(notes_file, "w") as f:
+        for line in lines:
+            key = line.partition(":")[0].strip()
+            if key in pending:
+                f.write(f"{key}: {pending.pop(key)}\n")
+            else:
+                f.write(line)
+        for key, value in pending.items():
+            f.write(f"{key}: {value}\n")
+
+
+def worker(notes_file, writer, updates, safe, start_event):
+    start_event.wait()
+    for n in range(1, updates + 1):
+        status = "Open" if n % 2 else "Closed"
+        try:
+            if safe:
+                caseMeta.update_case(os.path.dirname(notes_file), {"status": status},
+                                     add_tags=[f"w{writer}-{n}"], remove_tags=[f"w{writer}-{n - 1}"])
+            else:
+                unsafe_update(notes_file, {f"Writer {writer}": n, "Status": status})
+        except (OSError, ValueError):
+            pass  # the unsafe path can read a half-written file; count it as lost
+
+
+def check_record(case_dir, processes, updates):
+    record, _ = caseMeta.read(case_dir)
+    expected_tags = {f"w{writer}-{updates}" for writer in range(processes)}
+    base_intact = (record["case_id"] == "STRESS" and record["payment_status"] == "Not Paid"
+                   and record["description"] == "Concurrency test: many writers")
+    size = sum(os.path.getsize(os.path.join(case_dir, name)) for name in ("notes.txt", caseMeta.META_FILENAME))
+    return {
+        "lost_updates": processes * updates - record["revision"],
+        "tags_intact": set(record["tags"]) == expected_tags,
+        "base_fields_intact": base_intact,
+        "bytes": size,
+    }
+
+
+def check(notes_file, processes, updates):
+    with open(notes_file, "r") as f:
+        text = f.read()
+    fields = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition(":")
+        if sep:
+            fields[key.strip()] = value.strip()
+    lost = 0
+    for writer in range(processes):
+        try:
+            lost += updates - int(fields.get(f"Writer {writer}", 0))
+        except ValueError:
+            lost += updates
+    base_intact = all(
+        fields.get(line.partition(":")[0]) == line.partition(":")[2].strip()
+        for line in BASE_FIELDS if not line.startswith("Status")
+    )
+    return {"lost_updates": lost, "base_fields_intact": base_intact, "bytes": len(text)}
+
+
+def run(safe, processes, updates, work_dir):
+    case_dir = os.path.join(work_dir, "safe" if safe else "unsafe", "Case_STRESS")
+    os.makedirs(case_dir)
+    notes_file = os.path.join(case_dir, "notes.txt")
+    with open(notes_file, "w") as f:
+        f.write("\n".join(BASE_FIELDS) + "\n")
+    if safe:
+        caseMeta.load(case_dir)  # migrate, as the first real update would
+
+    ctx = multiprocessing.get_context("spawn")
+    start_event = ctx.Event()
+    procs = [ctx.Process(target=worker, args=(notes_file, k, updates, safe, start_event)) for k in range(processes)]
+    for p in procs:
+        p.start()
+    started = time.perf_counter()
+    start_event.set()
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - started
+
+    total = processes * updates
+    return {
+        "mode": "locked_atomic" if safe else "truncate_rewrite",
+        "processes": processes,
+        "updates": total,
+        "seconds": round(elapsed, 3),
+        "updates_per_second": round(total / elapsed, 1) if elapsed else None,
+        **(check_record(case_dir, processes, updates) if safe else check(notes_file, processes, updates)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress concurrent case metadata updates")
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--updates", type=int, default=200, help="updates per process")
+    parser.add_argument("--baseline", action="store_true", help="also run the old unlocked rewrite for comparison")
+    parser.add_argument("--dir", help="where to work (default: a temp dir)")
+    parser.add_argument("--output", help="write JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="ioc-notes-bench-", dir=args.dir)
+    try:
+        runs = [run(True, args.processes, args.updates, work_dir)]
+        if args.baseline:
+            runs.append(run(False, args.processes, args.updates, work_dir))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = {
+        "benchmark": "notes_updates",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": vars(args),
+        "runs": runs,
+    }
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload + "\n")
+        print(f"\n📊 Results written to {args.output}")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""File I/O made by one generate_case_report() call.
+
+Builds a throwaway case (see syntheticCases.build_case), then counts, while a
+report is generated, every open() of a Markdown note inside the case and
+every directory listing (os.walk / os.listdir / os.scandir) under it. The AI
+path runs against the mock LLM server, so the numbers come from a real end-to-end
+run. A healthy run reads each note exactly once and walks the tree once
+(os.walk's own os.scandir calls show up under "scandir").
+
+    python benchmarks/benchReportIO.py --sections-files 6 --modes traditional ai --output report_io.json
+"""
+import argparse
+import builtins
+import collections
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from mockLLMServer import MockState, start_server  # noqa: E402
+from syntheticCases import build_case  # noqa: E402
+
+
+@contextlib.contextmanager
+def count_io(case_path):
+    # Wraps the builtins the managers resolve at call time
+    reads = collections.Counter()
+    listings = collections.Counter()
+    real_open, real_walk, real_listdir, real_scandir = builtins.open, os.walk, os.listdir, os.scandir
+    prefix = case_path + os.sep
+
+    def inside(path):
+        return isinstance(path, str) and (path == case_path or path.startswith(prefix))
+
+    def counting_open(file, mode="r", *args, **kwargs):
+        if inside(file) and file.endswith(".md") and "r" in mode:
+            reads[os.path.relpath(file, case_path)] += 1
+        return real_open(file, mode, *args, **kwargs)
+
+    def counting_walk(top, *args, **kwargs):
+        if inside(top):
+            listings["walk"] += 1
+        return real_walk(top, *args, **kwargs)
+
+    def counting_listdir(path="."):
+        if inside(path):
+            listings["listdir"] += 1
+        return real_listdir(path)
+
+    def counting_scandir(path="."):
+        if inside(path):
+            listings["scandir"] += 1
+        return real_scandir(path)
+
+    builtins.open, os.walk, os.listdir, os.scandir = counting_open, counting_walk, counting_listdir, counting_scandir
+    try:
+        yield reads, listings
+    finally:
+        builtins.open, os.walk, os.listdir, os.scandir = real_open, real_walk, real_listdir, real_scandir
+
+
+def note_files(case_path, report_re):
+    notes = []
+    for root, _, files in os.walk(case_path):
+        for name in files:
+            if name.endswith(".md") and not report_re.match(name):
+                notes.append(os.path.relpath(os.path.join(root, name), case_path))
+    return notes
+
+
+def run_mode(acm, case_id, use_ai):
+    case_path = os.path.join(acm.BASE_DIR, f"Case_{case_id}")
+    notes = note_files(case_path, acm.REPORT_FILE_RE)
+    sink = io.StringIO()
+    with count_io(case_path) as (reads, listings), contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        started = time.perf_counter()
+        acm.generate_case_report(case_id, use_ai=use_ai, use_cache=False)
+        wall = time.perf_counter() - started
+
+    note_reads = sum(reads[rel] for rel in notes)
+    return {
+        "mode": "ai" if use_ai else "traditional",
+        "wall_seconds": round(wall, 3),
+        "notes_in_case": len(notes),
+        "note_reads": note_reads,
+        "max_reads_per_note": max(reads.values(), default=0),
+        "notes_read_more_than_once": sorted(rel for rel, n in reads.items() if n > 1),
+        "directory_listings": dict(listings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count the file I/O of one case report")
+    parser.add_argument("--sections-files", type=int, default=4, help="markdown files per section folder")
+    parser.add_argument("--note-kb", type=int, default=4, help="approximate size of each note")
+    parser.add_argument("--modes", nargs="+", choices=["traditional", "ai"], default=["traditional", "ai"])
+    parser.add_argument("--latency", type=float, default=0.0, help="mock LLM latency per request")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp(prefix="ioc-report-io-")
+    state = MockState(latency=args.latency, seed=args.seed)
+    server, base_url = start_server(state)
+
+    # Everything the case manager reads at import time must be set first
+    os.environ["HOME"] = home
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["OPENAI_API_KEY"] = "sk-mock-benchmark-key"
+    os.environ["OPENAI_RPM_LIMIT"] = "100000"  # I/O is measured here, not pacing
+    os.environ["OPENAI_TPM_LIMIT"] = "100000000"
+
+    import advanceCaseManager as acm
+
+    case_id = "IO"
+    build_case(acm.BASE_DIR, case_id, acm.SUBFOLDERS, args.sections_files, args.note_kb, args.seed)
+
+    # Proceed past the Strategic Priorities check and overwrite earlier reports
+    builtins.input = lambda prompt="": "2" if "1/2/3" in prompt else "o"
+
+    runs = [run_mode(acm, case_id, mode == "ai") for mode in args.modes]
+    server.shutdown()
+
+    results = {
+        "benchmark": "report_io",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "runs": runs,
+    }
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload + "\n")
+        print(f"\n📊 Results written to {args.output}")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
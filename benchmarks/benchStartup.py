@@ -0,0 +1,144 @@
+"""Startup-time benchmark for the case managers.
+
+Two measurements, each in a fresh interpreter under a temporary HOME:
+
+  first_menu  wall time from process launch until the main menu's
+              "Enter choice:" prompt is printed (then 99 is sent to exit)
+  importtime  `python -X importtime -c "import <module>"` parsed into the
+              slowest top-level imports by cumulative time
+
+The target is first_menu p50 under --target-ms (200 ms by default); the exit
+status is 1 when it is missed, so this can gate CI.
+
+    python benchmarks/benchStartup.py --module advanceCaseManager --runs 10 --output startup.json
+"""
+import argparse
+import json
+import os
+import platform
+import select
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(HERE)
+PROMPT = b"Enter choice:"
+
+
+def child_env(home):
+    env = dict(os.environ)
+    env["HOME"] = home
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO, env.get("PYTHONPATH")]))
+    env["PYTHONUNBUFFERED"] = "1"
+    return env
+
+
+def time_to_first_menu(module, home, timeout=30):
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(REPO, f"{module}.py")],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        env=child_env(home), cwd=home,
+    )
+    output = b""
+    elapsed = None
+    while PROMPT not in output and time.perf_counter() - started < timeout:
+        ready, _, _ = select.select([proc.stdout], [], [], 0.05)
+        if ready:
+            data = os.read(proc.stdout.fileno(), 65536)
+            if not data:
+                break
+            output += data
+    if PROMPT in output:
+        elapsed = time.perf_counter() - started
+    try:
+        proc.communicate(b"99\n", timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+    if elapsed is None:
+        raise RuntimeError(f"{module} never showed the menu: {output[-500:]!r}")
+    return elapsed
+
+
+def import_breakdown(module, home, top):
+    # -X importtime lines: "import time: self [us] | cumulative | imported package"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=child_env(home), cwd=home,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name[1:]  # nesting is two spaces per level after the separator's own space
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append({"module": name.strip(), "depth": depth,
+                        "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    # Children are printed before their parent, so the module's direct imports
+    # are the depth-1 lines between the previous top-level import and its own line
+    end = next((i for i, e in enumerate(entries) if e["depth"] == 0 and e["module"] == module), len(entries))
+    start = next((i + 1 for i in range(end - 1, -1, -1) if entries[i]["depth"] == 0), 0)
+    total = entries[end]["cumulative_ms"] if end < len(entries) else None
+    top_level = [e for e in entries[start:end] if e["depth"] == 1]
+    top_level.sort(key=lambda e: e["cumulative_ms"], reverse=True)
+    return {
+        "module_cumulative_ms": total,
+        "slowest_imports": [
+            {"module": e["module"], "cumulative_ms": round(e["cumulative_ms"], 2), "self_ms": round(e["self_ms"], 2)}
+            for e in top_level[:top]
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time to first menu and import cost")
+    parser.add_argument("--module", choices=["caseManager", "advanceCaseManager"], default="advanceCaseManager")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to report")
+    parser.add_argument("--target-ms", type=float, default=200)
+    parser.add_argument("--output", help="write JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp(prefix="ioc-startup-bench-")
+    # One warm-up so .pyc files and the index exist, as they would for a real user
+    time_to_first_menu(args.module, home)
+    samples = sorted(time_to_first_menu(args.module, home) for _ in range(args.runs))
+    p50_ms = statistics.median(samples) * 1000
+
+    results = {
+        "benchmark": "startup",
+        "module": args.module,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": vars(args),
+        "first_menu": {
+            "runs": len(samples),
+            "min_ms": round(samples[0] * 1000, 2),
+            "p50_ms": round(p50_ms, 2),
+            "max_ms": round(samples[-1] * 1000, 2),
+            "target_ms": args.target_ms,
+            "meets_target": p50_ms <= args.target_ms,
+        },
+        "importtime": import_breakdown(args.module, home, args.top),
+    }
+
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload + "\n")
+        print(f"\n📊 Results written to {args.output}")
+    else:
+        print(payload)
+    status = "✅" if results["first_menu"]["meets_target"] else "❌"
+    print(f"{status} First menu p50: {p50_ms:.0f} ms (target {args.target_ms:.0f} ms)", file=sys.stderr)
+    sys.exit(0 if results["first_menu"]["meets_target"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Creation time and disk usage of vault template provisioning.
+
+Builds a synthetic .obsidian template (plugins, themes, snippets and the
+JSON files Obsidian rewrites), then provisions --vaults case vaults per mode
+with vaultTemplate.provision(). Disk usage is reported three ways:
+
+  apparent_mb  sum of file sizes, what a naive copy would need
+  inode_mb     allocated blocks of inodes not shared with the template
+               (hardlinks count as free; reflinked files still count)
+  df_delta_mb  drop in filesystem free space, the only figure that shows
+               reflink savings; noisy on busy disks
+
+    python benchmarks/benchVaultProvision.py --plugins 40 --files-per-plugin 25 --vaults 50 --output vault_bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import vaultTemplate  # noqa: E402
+
+MUTABLE_FILES = ["workspace.json", "app.json", "appearance.json", "core-plugins.json",
+                 "community-plugins.json", "hotkeys.json", "graph.json"]
+
+
+def write_blob(path, size, rng):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(rng.randbytes(size))
+
+
+def build_template(root, plugins, files_per_plugin, asset_kb, themes, seed):
+    rng = random.Random(seed)
+    template = os.path.join(root, ".obsidian")
+    for name in MUTABLE_FILES:
+        write_blob(os.path.join(template, name), 2048, rng)
+    for p in range(plugins):
+        plugin_dir = os.path.join(template, "plugins", f"plugin-{p:03d}")
+        write_blob(os.path.join(plugin_dir, "main.js"), asset_kb * 1024 * 4, rng)
+        write_blob(os.path.join(plugin_dir, "manifest.json"), 512, rng)
+        write_blob(os.path.join(plugin_dir, "data.json"), 1024, rng)
+        for n in range(max(0, files_per_plugin - 3)):
+            write_blob(os.path.join(plugin_dir, "assets", f"asset-{n:03d}.bin"), asset_kb * 1024, rng)
+    for t in range(themes):
+        write_blob(os.path.join(template, "themes", f"theme-{t}", "theme.css"), asset_kb * 1024 * 2, rng)
+    write_blob(os.path.join(template, "snippets", "custom.css"), 4096, rng)
+    return template
+
+
+def tree_usage(path, template_inodes):
+    apparent = 0
+    allocated = 0
+    seen = set()
+    for root, _, files in os.walk(path):
+        for name in files:
+            st = os.lstat(os.path.join(root, name))
+            apparent += st.st_size
+            key = (st.st_dev, st.st_ino)
+            if key in seen or key in template_inodes:
+                continue
+            seen.add(key)
+            allocated += st.st_blocks * 512
+    return apparent, allocated
+
+
+def free_bytes(path):
+    st = os.statvfs(path)
+    return st.f_bavail * st.f_frsize
+
+
+def bench_mode(mode, template, work_dir, vaults):
+    template_inodes = set()
+    for root, _, files in os.walk(template):
+        for name in files:
+            st = os.lstat(os.path.join(root, name))
+            template_inodes.add((st.st_dev, st.st_ino))
+
+    mode_dir = os.path.join(work_dir, mode)
+    os.makedirs(mode_dir)
+    os.sync()
+    free_before = free_bytes(mode_dir)
+    timings = []
+    totals = {"reflink": 0, "hardlink": 0, "copy": 0, "symlink": 0}
+    for n in range(vaults):
+        started = time.perf_counter()
+        stats = vaultTemplate.provision(template, os.path.join(mode_dir, f"Case_{n:05d}", ".obsidian"), mode=mode)
+        timings.append(time.perf_counter() - started)
+        for key in totals:
+            totals[key] += stats[key]
+    os.sync()
+    free_after = free_bytes(mode_dir)
+    apparent, allocated = tree_usage(mode_dir, template_inodes)
+    shutil.rmtree(mode_dir)
+
+    timings.sort()
+    return {
+        "mode": mode,
+        "vaults": vaults,
+        "total_seconds": round(sum(timings), 3),
+        "per_vault_ms": {
+            "mean": round(statistics.fmean(timings) * 1000, 3),
+            "p50": round(timings[len(timings) // 2] * 1000, 3),
+            "max": round(timings[-1] * 1000, 3),
+        },
+        "files_by_method": totals,
+        "apparent_mb": round(apparent / 1024 / 1024, 2),
+        "inode_mb": round(allocated / 1024 / 1024, 2),
+        "df_delta_mb": round(max(0, free_before - free_after) / 1024 / 1024, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vault template provisioning modes")
+    parser.add_argument("--plugins", type=int, default=30)
+    parser.add_argument("--files-per-plugin", type=int, default=20)
+    parser.add_argument("--asset-kb", type=int, default=16)
+    parser.add_argument("--themes", type=int, default=5)
+    parser.add_argument("--vaults", type=int, default=20, help="case vaults provisioned per mode")
+    parser.add_argument("--modes", nargs="+", choices=vaultTemplate.MODES, default=list(vaultTemplate.MODES))
+    parser.add_argument("--dir", help="where to work (default: a temp dir); use the disk your cases live on")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="ioc-vault-bench-", dir=args.dir)
+    try:
+        template = build_template(work_dir, args.plugins, args.files_per_plugin, args.asset_kb, args.themes, args.seed)
+        template_files = sum(len(files) for _, _, files in os.walk(template))
+        template_bytes = sum(os.path.getsize(os.path.join(root, name))
+                             for root, _, files in os.walk(template) for name in files)
+        results = {
+            "benchmark": "vault_provisioning",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": vars(args),
+            "template": {"files": template_files, "mb": round(template_bytes / 1024 / 1024, 2)},
+            "modes": [bench_mode(mode, template, work_dir, args.vaults) for mode in args.modes],
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload + "\n")
+        print(f"\n📊 Results written to {args.output}")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""Local stand-in for the OpenAI chat-completions API.
+
+Speaks just enough of POST /v1/chat/completions (plain and streamed) for the
+case manager's report pipeline, with configurable latency, token throughput
+and injected 429s. Every completion carries x-ratelimit-* headers advertising
+--rpm-limit/--tpm-limit, as the real API does. GET /stats returns request/token
+counters as JSON.
+
+    python benchmarks/mockLLMServer.py --port 8765 --latency 0.5 --tokens-per-second 80
+    export OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=sk-mock
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def approx_tokens(text):
+    # Close enough to tiktoken for English prose without needing it installed
+    return max(1, len(text) // 4)
+
+
+class MockState:
+    def __init__(self, latency=0.2, tokens_per_second=0, completion_tokens=150,
+                 rate_limit_every=0, rate_limit_probability=0.0, retry_after=1.0, seed=None,
+                 rpm_limit=10000, tpm_limit=2000000):
+        self.latency = latency
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.rate_limit_every = rate_limit_every
+        self.rate_limit_probability = rate_limit_probability
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "completed": 0,
+            "rate_limited": 0,
+            "streamed": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "max_in_flight": 0,
+        }
+        self.in_flight = 0
+
+    def admit(self, prompt_tokens):
+        # Returns False when this request should be answered with a 429
+        with self.lock:
+            self.stats["requests"] += 1
+            n = self.stats["requests"]
+            limited = (
+                (self.rate_limit_every and n % self.rate_limit_every == 0)
+                or (self.rate_limit_probability and self.random.random() < self.rate_limit_probability)
+            )
+            if limited:
+                self.stats["rate_limited"] += 1
+                return False
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.in_flight += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.in_flight)
+            return True
+
+    def done(self, completion_tokens, streamed):
+        with self.lock:
+            self.in_flight -= 1
+            self.stats["completed"] += 1
+            self.stats["completion_tokens"] += completion_tokens
+            if streamed:
+                self.stats["streamed"] += 1
+
+    def rate_headers(self):
+        # Advertised limits only; the mock never throttles on them
+        return {
+            "x-ratelimit-limit-requests": str(self.rpm_limit),
+            "x-ratelimit-remaining-requests": str(self.rpm_limit),
+            "x-ratelimit-limit-tokens": str(self.tpm_limit),
+            "x-ratelimit-remaining-tokens": str(self.tpm_limit),
+        }
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats)
+
+    def reset(self):
+        with self.lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so client connection pooling is exercised
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status, payload, headers=None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _write_chunk(self, data):
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/stats":
+                self._send_json(200, state.snapshot())
+            else:
+                self._send_json(404, {"error": {"message": "not found"}})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            raw = self.rfile.read(length)
+            path = self.path.rstrip("/")
+
+            if path == "/stats/reset":
+                state.reset()
+                self._send_json(200, {"ok": True})
+                return
+            if not path.endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": "not found"}})
+                return
+
+            try:
+                request = json.loads(raw or b"{}")
+            except ValueError:
+                self._send_json(400, {"error": {"message": "invalid JSON"}})
+                return
+
+            messages = request.get("messages", [])
+            prompt_tokens = sum(approx_tokens(m.get("content") or "") for m in messages)
+            if not state.admit(prompt_tokens):
+                self._send_json(
+                    429,
+                    {"error": {"message": "Rate limit reached (mock)", "type": "requests", "code": "rate_limit_exceeded"}},
+                    {"Retry-After": str(state.retry_after), "retry-after-ms": str(int(state.retry_after * 1000)),
+                     **state.rate_headers()},
+                )
+                return
+
+            model = request.get("model", "gpt-4")
+            stream = bool(request.get("stream"))
+            words = ["finding"] * state.completion_tokens
+            words[0] = f"Summary of {prompt_tokens} prompt tokens:"
+            delay = 1 / state.tokens_per_second if state.tokens_per_second else 0
+
+            time.sleep(state.latency)
+            try:
+                if stream:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Transfer-Encoding", "chunked")
+                    for key, value in state.rate_headers().items():
+                        self.send_header(key, value)
+                    self.end_headers()
+                    for i, word in enumerate(words):
+                        event = {
+                            "id": "chatcmpl-mock",
+                            "object": "chat.completion.chunk",
+                            "created": int(time.time()),
+                            "model": model,
+                            "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}],
+                        }
+                        self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                        if delay:
+                            time.sleep(delay)
+                    final = {
+                        "id": "chatcmpl-mock",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                    }
+                    self._write_chunk(f"data: {json.dumps(final)}\n\n".encode("utf-8"))
+                    self._write_chunk(b"data: [DONE]\n\n")
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.wfile.flush()
+                else:
+                    if delay:
+                        time.sleep(delay * len(words))
+                    self._send_json(200, {
+                        "id": "chatcmpl-mock",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{
+                            "index": 0,
+                            "message": {"role": "assistant", "content": " ".join(words)},
+                            "finish_reason": "stop",
+                        }],
+                        "usage": {
+                            "prompt_tokens": prompt_tokens,
+                            "completion_tokens": len(words),
+                            "total_tokens": prompt_tokens + len(words),
+                        },
+                    }, state.rate_headers())
+            finally:
+                state.done(len(words), stream)
+
+    return Handler
+
+
+def start_server(state, host="127.0.0.1", port=0):
+    # Starts the server on a daemon thread; returns (server, base_url)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock OpenAI chat-completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0, help="0 = respond instantly")
+    parser.add_argument("--completion-tokens", type=int, default=150)
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="answer every Nth request with 429")
+    parser.add_argument("--rate-limit-probability", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--rpm-limit", type=int, default=10000, help="advertised in x-ratelimit-limit-requests")
+    parser.add_argument("--tpm-limit", type=int, default=2000000, help="advertised in x-ratelimit-limit-tokens")
+    args = parser.parse_args()
+
+    state = MockState(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        rate_limit_every=args.rate_limit_every,
+        rate_limit_probability=args.rate_limit_probability,
+        retry_after=args.retry_after,
+        seed=args.seed,
+        rpm_limit=args.rpm_limit,
+        tpm_limit=args.tpm_limit,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    server.daemon_threads = True
+    print(f"🧪 Mock LLM listening on http://{args.host}:{server.server_address[1]}/v1", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
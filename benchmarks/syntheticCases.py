@@ -0,0 +1,174 @@
+"""Synthetic ~/Investigations trees for benchmarking.
+
+Generates Case_<ID> folders that follow the SUBFOLDERS layout, with
+configurable note sizes, files per section and a share of lines carrying
+wallet addresses, URLs, emails and @handles. A small pool of indicators is
+reused across cases so cross-case lookups have something to find.
+
+    python benchmarks/syntheticCases.py /tmp/Investigations --cases 1000 --note-kb 4
+"""
+import argparse
+import hashlib
+import os
+import random
+import time
+
+SUBFOLDERS = [
+    "0. Introduction",
+    "1. Blockchain Analysis",
+    "2. OSINT",
+    "3. Evidence",
+    "4. Report",
+    "99. Tasks"
+]
+
+WORDS = (
+    "wallet transfer exchange suspect victim deposit withdrawal mixer bridge swap "
+    "account subpoena evidence timeline chain hop cluster address analysis kyc"
+).split()
+
+STATUSES = ["Open", "Closed"]
+PAYMENT_STATUSES = ["Not Paid", "Partial Payment", "Paid"]
+BASE58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+BECH32 = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+
+
+def base58check(version, payload):
+    # Legacy (version 0, "1...") or P2SH (version 5, "3...") address with a valid checksum
+    raw = bytes([version]) + payload
+    raw += hashlib.sha256(hashlib.sha256(raw).digest()).digest()[:4]
+    number = int.from_bytes(raw, "big")
+    text = ""
+    while number:
+        number, digit = divmod(number, 58)
+        text = BASE58[digit] + text
+    return "1" * (len(raw) - len(raw.lstrip(b"\0"))) + text
+
+
+def bech32_address(program):
+    # Native segwit v0 ("bc1q...") address with a valid BIP-173 checksum
+    data, acc, bits = [0], 0, 0
+    for byte in program:
+        acc, bits = (acc << 8) | byte, bits + 8
+        while bits >= 5:
+            bits -= 5
+            data.append((acc >> bits) & 31)
+    if bits:
+        data.append((acc << (5 - bits)) & 31)
+    checksum = 1
+    for v in [3, 3, 0, 2, 3] + data + [0] * 6:  # "bc" expanded, then room for the checksum
+        top = checksum >> 25
+        checksum = (checksum & 0x1FFFFFF) << 5 ^ v
+        for i, gen in enumerate((0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)):
+            if (top >> i) & 1:
+                checksum ^= gen
+    checksum ^= 1
+    data += [(checksum >> 5 * (5 - i)) & 31 for i in range(6)]
+    return "bc1" + "".join(BECH32[d] for d in data)
+
+
+def make_indicator(rng):
+    kind = rng.choice(("eth", "btc", "tron", "url", "email", "handle"))
+    if kind == "eth":
+        return f"0x{rng.getrandbits(160):040x}"
+    if kind == "btc":
+        # Real checksums, or the indexer (which verifies them) would skip every one
+        payload = rng.getrandbits(160).to_bytes(20, "big")
+        style = rng.choice(("p2pkh", "p2sh", "bech32"))
+        if style == "bech32":
+            return bech32_address(payload)
+        return base58check(0 if style == "p2pkh" else 5, payload)
+    if kind == "tron":
+        return "T" + "".join(rng.choice(BASE58) for _ in range(33))
+    if kind == "url":
+        return f"https://etherscan.io/address/0x{rng.getrandbits(160):040x}?tab=transactions&page={rng.randint(1, 50)}"
+    if kind == "email":
+        return f"{rng.choice(WORDS)}{rng.randint(1, 9999)}@example.com"
+    return f"@{rng.choice(WORDS)}_{rng.randint(1, 9999)}"
+
+
+def make_shared_pool(seed, size=50):
+    rng = random.Random(f"shared-{seed}")
+    return [make_indicator(rng) for _ in range(size)]
+
+
+def write_note(path, target_bytes, rng, indicator_rate=0.1, shared_pool=None, shared_rate=0.1):
+    lines = [f"# {os.path.splitext(os.path.basename(path))[0]}", ""]
+    size = sum(len(line) + 1 for line in lines)
+    while size < target_bytes:
+        roll = rng.random()
+        if roll < 0.08:
+            line = f"## Finding {len(lines)}"
+        elif roll < 0.15:
+            line = ""
+        else:
+            line = " ".join(rng.choice(WORDS) for _ in range(14))
+            if rng.random() < indicator_rate:
+                if shared_pool and rng.random() < shared_rate:
+                    line += " " + rng.choice(shared_pool)
+                else:
+                    line += " " + make_indicator(rng)
+        lines.append(line)
+        size += len(line) + 1
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def write_notes_txt(case_path, case_id, rng, created=None):
+    created = created or time.strftime("%Y-%m-%d %H:%M:%S")
+    with open(os.path.join(case_path, "notes.txt"), "w") as f:
+        f.write(f"Case ID: {case_id}\n")
+        f.write(f"Status: {rng.choice(STATUSES)}\n")
+        f.write(f"Description: Synthetic case {case_id}: {' '.join(rng.choice(WORDS) for _ in range(6))}\n")
+        f.write(f"Payment Status: {rng.choice(PAYMENT_STATUSES)}\n")
+        f.write(f"Created: {created}\n")
+
+
+def build_case(base_dir, case_id, subfolders=SUBFOLDERS, files_per_section=1, note_kb=4,
+               seed=1, indicator_rate=0.1, shared_pool=None):
+    # One case: a <section>.md per subfolder plus files_per_section-1 extra notes
+    rng = random.Random(f"{seed}-{case_id}")
+    case_path = os.path.join(base_dir, f"Case_{case_id}")
+    for sub in subfolders:
+        os.makedirs(os.path.join(case_path, sub), exist_ok=True)
+        for n in range(files_per_section):
+            name = f"{sub}.md" if n == 0 else f"{sub} note {n}.md"
+            write_note(os.path.join(case_path, sub, name), note_kb * 1024, rng, indicator_rate, shared_pool)
+    write_notes_txt(case_path, case_id, rng)
+    return case_path
+
+
+def case_ids(count, prefix="SYN"):
+    width = max(len(str(count)), 4)
+    return [f"{prefix}{n:0{width}d}" for n in range(1, count + 1)]
+
+
+def generate_tree(base_dir, cases=100, files_per_section=1, note_kb=4, seed=1,
+                  indicator_rate=0.1, subfolders=SUBFOLDERS, prefix="SYN"):
+    # Builds `cases` case folders under base_dir and returns their IDs
+    os.makedirs(base_dir, exist_ok=True)
+    shared_pool = make_shared_pool(seed)
+    ids = case_ids(cases, prefix)
+    for case_id in ids:
+        build_case(base_dir, case_id, subfolders, files_per_section, note_kb, seed, indicator_rate, shared_pool)
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Investigations tree")
+    parser.add_argument("base_dir", help="folder to create the Case_<ID> folders in")
+    parser.add_argument("--cases", type=int, default=100)
+    parser.add_argument("--files-per-section", type=int, default=1)
+    parser.add_argument("--note-kb", type=float, default=4)
+    parser.add_argument("--indicator-rate", type=float, default=0.1, help="share of lines carrying an address/URL/etc.")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    ids = generate_tree(args.base_dir, args.cases, args.files_per_section, args.note_kb,
+                        args.seed, args.indicator_rate)
+    print(f"✅ Generated {len(ids)} cases in {args.base_dir} ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
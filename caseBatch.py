@@ -0,0 +1,143 @@
+import contextlib
+import importlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import caseIndex
+
+BATCH_PROCESSES = os.cpu_count() or 2  # traditional reports are CPU/disk bound: one process per core
+BATCH_AI_CASES = 3  # AI reports in flight at once; all their requests share aiClient's rate limiter
+RUNS_DIRNAME = ".batch_runs"  # hidden, so the index scan ignores it
+
+
+def select_cases(base_dir, **filters):
+    # Case IDs matching caseIndex.query_cases() filters, e.g. status="Open"
+    cases, _ = caseIndex.query_cases(base_dir, **filters)
+    return [case["case_id"] for case in cases]
+
+
+def _module_name(manager):
+    # Workers import the manager by file name; run as a script it is "__main__"
+    if manager.__name__ != "__main__":
+        return manager.__name__
+    return os.path.splitext(os.path.basename(manager.__file__))[0]
+
+
+def _run_one(manager, case_id, options):
+    # A report written with failed AI output still counts as a failed case
+    started = time.perf_counter()
+    failures = []
+    try:
+        path = manager.generate_case_report(case_id, failures=failures, **options)
+    except Exception as e:
+        return {"case_id": case_id, "ok": False, "error": f"{type(e).__name__}: {e}",
+                "seconds": round(time.perf_counter() - started, 3)}
+    seconds = round(time.perf_counter() - started, 3)
+    if not path:
+        return {"case_id": case_id, "ok": False, "error": "case not found", "seconds": seconds}
+    if failures:
+        return {"case_id": case_id, "ok": False, "path": path, "error": "; ".join(failures), "seconds": seconds}
+    return {"case_id": case_id, "ok": True, "path": path, "seconds": seconds}
+
+
+def _process_worker(module_name, base_dir, case_id, options):
+    # Runs in a pool process: its own copy of the manager, console output discarded
+    manager = importlib.import_module(module_name)
+    manager.BASE_DIR = base_dir
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        return _run_one(manager, case_id, options)
+
+
+def _save_run(base_dir, summary):
+    runs_dir = os.path.join(base_dir, RUNS_DIRNAME)
+    os.makedirs(runs_dir, exist_ok=True)
+    path = os.path.join(runs_dir, f"batch_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.json")
+    with open(path, "w") as f:
+        json.dump(summary, f, indent=2)
+    return path
+
+
+def run_batch(manager, case_ids, use_ai=False, workers=None, on_existing="overwrite", use_cache=True,
+              progress=None):
+    # Generate a report for every case without prompting. Traditional reports
+    # fan out over a process pool; AI reports run on a few threads so every
+    # request goes through the one shared rate limiter and client pool.
+    # progress(result, done, total, console) is called as each case finishes,
+    # with console being stdout as it was before the managers' chatter was
+    # silenced. Returns the run summary, also saved under <base_dir>/.batch_runs/.
+    case_ids = list(dict.fromkeys(case_ids))
+    options = {"use_ai": use_ai, "prompt": False, "on_existing": on_existing}
+    if not use_cache:
+        import inspect  # only needed here; kept off the managers' startup path
+        if "use_cache" not in inspect.signature(manager.generate_case_report).parameters:
+            raise ValueError(f"{_module_name(manager)} has no cache to bypass; use_cache=False needs advanceCaseManager")
+        options["use_cache"] = False
+    shared_limiter = getattr(manager, "aiClient", None) is not None
+    if use_ai:
+        # A manager that calls OpenAI directly has no shared limiter: one case at a time
+        workers = (workers or BATCH_AI_CASES) if shared_limiter else 1
+    else:
+        workers = workers or BATCH_PROCESSES
+    workers = max(1, min(workers, len(case_ids) or 1))
+
+    results = []
+    console = sys.stdout
+    calls_before = manager.aiClient.call_stats["calls"] if shared_limiter else 0
+    started = time.perf_counter()
+    if use_ai:
+        # redirect_stdout is process-wide, so it wraps the whole pool rather than each thread
+        sink = io.StringIO()
+        with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink), \
+                ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_one, manager, case_id, options) for case_id in case_ids]
+            for future in as_completed(futures):
+                results.append(future.result())
+                if progress:
+                    progress(results[-1], len(results), len(case_ids), console)
+    else:
+        from concurrent.futures import ProcessPoolExecutor  # pulls in multiprocessing; only needed here
+        module_name = _module_name(manager)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_process_worker, module_name, manager.BASE_DIR, case_id, options): case_id
+                for case_id in case_ids
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:  # the worker process itself died
+                    result = {"case_id": futures[future], "ok": False, "error": f"{type(e).__name__}: {e}",
+                              "seconds": 0.0}
+                results.append(result)
+                if progress:
+                    progress(result, len(results), len(case_ids), console)
+
+    order = {case_id: n for n, case_id in enumerate(case_ids)}
+    results.sort(key=lambda r: order[r["case_id"]])
+    seconds = [r["seconds"] for r in results]
+    summary = {
+        "mode": "ai" if use_ai else "traditional",
+        "workers": workers,
+        "cases": len(case_ids),
+        "succeeded": sum(1 for r in results if r["ok"]),
+        "failed": sum(1 for r in results if not r["ok"]),
+        "wall_seconds": round(time.perf_counter() - started, 3),
+        "case_seconds_total": round(sum(seconds), 3),
+        "slowest_case_seconds": max(seconds, default=0.0),
+        "results": results,
+    }
+    if use_ai and shared_limiter:
+        summary["ai_calls"] = manager.aiClient.call_stats["calls"] - calls_before
+    summary["summary_path"] = _save_run(manager.BASE_DIR, summary)
+    return summary
+
+
+def print_progress(result, done, total, console):
+    mark = "✅" if result["ok"] else "❌"
+    detail = f"{result['seconds']:.2f}s" if result["ok"] else result["error"]
+    print(f"{mark} [{done}/{total}] Case {result['case_id']} — {detail}", file=console, flush=True)
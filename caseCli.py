@@ -0,0 +1,361 @@
+import argparse
+import contextlib
+import inspect
+import io
+import json
+import os
+import sys
+import time
+
+import caseBatch
+import caseIndex
+import caseMeta
+import caseNotes
+import caseIntake
+from caseMeta import STATUSES, PAYMENT_STATUSES
+
+
+def read_ids(ids):
+    # A lone "-" reads one case ID per line from stdin
+    if ids == ["-"]:
+        return [line.strip() for line in sys.stdin if line.strip()]
+    return ids
+
+
+def read_records(stream):
+    # One JSON object per line: {"case_id", "status", "description", "payment_status", "tags"}
+    for line_no, line in enumerate(stream, start=1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield {"_error": f"line {line_no}: invalid JSON ({e})"}
+
+
+def quiet(args):
+    # The managers report progress with print(); keep stdout for the JSON result
+    target = io.StringIO() if args.quiet else sys.stderr
+    return contextlib.redirect_stdout(target)
+
+
+def case_summary(manager, case_id):
+    case_path = os.path.join(manager.BASE_DIR, f"Case_{case_id}")
+    notes_file = os.path.join(case_path, "notes.txt")
+    if not os.path.exists(notes_file):
+        return None
+
+    record, _ = caseMeta.read(case_path)
+    with open(notes_file, "rb") as f:
+        data = f.read()
+    sections = []
+    for sub in manager.SUBFOLDERS:
+        sub_path = os.path.join(case_path, sub)
+        if not os.path.isdir(sub_path):
+            sections.append({"name": sub, "exists": False, "files": []})
+            continue
+        files = []
+        with os.scandir(sub_path) as it:
+            for entry in sorted(it, key=lambda e: e.name):
+                if entry.is_file():
+                    st = entry.stat()
+                    files.append({"name": entry.name, "size": st.st_size, "modified": st.st_mtime})
+        sections.append({"name": sub, "exists": True, "files": files})
+
+    return {
+        "case": caseIndex.get_case(manager.BASE_DIR, case_id),
+        "path": case_path,
+        "metadata": record,
+        "notes": data.decode("utf-8", errors="replace"),
+        "version": record["revision"],
+        "sections": sections,
+    }
+
+
+def cmd_create(manager, args):
+    if args.case_id == "-":
+        records = list(read_records(sys.stdin))
+    else:
+        records = [{
+            "case_id": args.case_id,
+            "status": args.status,
+            "description": args.description,
+            "payment_status": args.payment,
+            "tags": args.tag,
+        }]
+
+    results = []
+    for record in records:
+        if "_error" in record:
+            results.append({"case_id": None, "ok": False, "error": record["_error"]})
+            continue
+        record = caseIntake.normalize_record(record)
+        case_id = record["case_id"]
+        error = caseIntake.validate_record(record)
+        if error:
+            results.append({"case_id": case_id, "ok": False, "error": error})
+        else:
+            with quiet(args):
+                path = manager.create_case(case_id, record["status"], record["description"],
+                                           record["payment_status"], open_obsidian=False, tags=record["tags"])
+            if path:
+                results.append({"case_id": case_id, "ok": True, "path": path})
+            else:
+                results.append({"case_id": case_id, "ok": False, "error": "case already exists"})
+    return results
+
+
+def cmd_intake(manager, args):
+    if not os.path.isfile(args.file):
+        raise SystemExit(f"intake: {args.file} not found")
+    with quiet(args):
+        results, summary = caseIntake.bulk_intake(manager, args.file, args.format, args.workers, args.dry_run)
+    return {"results": results, "summary": summary, "ok": summary["failed"] == 0}
+
+
+def cmd_list(manager, args):
+    cases, total = caseIndex.query_cases(
+        manager.BASE_DIR, status=args.status, payment_status=args.payment,
+        created_from=args.created_from, created_to=args.created_to, text=args.text, tag=args.tag,
+        sort=args.sort, descending=args.desc, limit=args.limit, offset=args.offset,
+    )
+    return {"total": total, "offset": args.offset, "count": len(cases), "cases": cases}
+
+
+def cmd_show(manager, args):
+    results = []
+    for case_id in read_ids(args.case_ids):
+        summary = case_summary(manager, case_id)
+        if summary is None:
+            results.append({"case_id": case_id, "ok": False, "error": "case not found"})
+        else:
+            results.append({"case_id": case_id, "ok": True, **summary})
+    return results
+
+
+def cmd_update(manager, args):
+    if not args.status and not args.payment:
+        raise SystemExit("update: give --status and/or --payment")
+    case_ids = read_ids(args.case_ids)
+    if args.expect_version and len(case_ids) != 1:
+        raise SystemExit("update: --expect-version applies to a single case")
+    results = []
+    for case_id in case_ids:
+        notes_file = caseNotes.notes_path(manager.BASE_DIR, case_id)
+        if not os.path.exists(notes_file):
+            results.append({"case_id": case_id, "ok": False, "error": "case not found"})
+            continue
+        with quiet(args):
+            if args.payment:
+                current = caseIndex.get_case(manager.BASE_DIR, case_id)
+                status = args.status or (current["status"] if current else "")
+                ok = manager.update_status_and_payment(case_id, status, args.payment, args.expect_version)
+            else:
+                ok = manager.update_status(case_id, args.status, args.expect_version)
+        if ok:
+            results.append({"case_id": case_id, "ok": True, "case": caseIndex.get_case(manager.BASE_DIR, case_id),
+                            "version": caseMeta.read_revision(os.path.dirname(notes_file))})
+        else:
+            results.append({"case_id": case_id, "ok": False, "error": "version conflict: case changed"})
+    return results
+
+
+def cmd_tag(manager, args):
+    if not args.add and not args.remove:
+        raise SystemExit("tag: give --add and/or --remove")
+    case_ids = read_ids(args.case_ids)
+    if args.expect_version and len(case_ids) != 1:
+        raise SystemExit("tag: --expect-version applies to a single case")
+    results = []
+    for case_id in case_ids:
+        case_path = os.path.join(manager.BASE_DIR, f"Case_{case_id}")
+        if not os.path.exists(os.path.join(case_path, caseNotes.NOTES_FILENAME)):
+            results.append({"case_id": case_id, "ok": False, "error": "case not found"})
+            continue
+        try:
+            record = caseMeta.update_case(case_path, expected_revision=args.expect_version,
+                                          add_tags=args.add, remove_tags=args.remove)
+        except caseNotes.NotesConflict:
+            results.append({"case_id": case_id, "ok": False, "error": "version conflict: case changed"})
+            continue
+        caseIndex.record_case(manager.BASE_DIR, record)
+        results.append({"case_id": case_id, "ok": True, "tags": record["tags"], "version": record["revision"]})
+    return results
+
+
+def cmd_migrate(manager, args):
+    migrated = caseMeta.migrate_tree(manager.BASE_DIR)
+    caseIndex.reconcile(manager.BASE_DIR)
+    return {"migrated": len(migrated), "case_ids": migrated}
+
+
+def cmd_delete(manager, args):
+    if not args.yes:
+        raise SystemExit("delete: pass --yes to confirm deleting without a prompt")
+    results = []
+    for case_id in read_ids(args.case_ids):
+        with quiet(args):
+            ok = manager.delete_case(case_id, confirm=False)
+        results.append({"case_id": case_id, "ok": ok} if ok else {"case_id": case_id, "ok": False, "error": "case not found"})
+    return results
+
+
+def cmd_report(manager, args):
+    if args.ai and not manager.get_api_key():
+        raise SystemExit("report: no OpenAI API key found (set OPENAI_API_KEY or use option 8 in the menu)")
+
+    options = {"use_ai": args.ai, "prompt": False, "on_existing": "version" if args.new_version else "overwrite"}
+    accepted = inspect.signature(manager.generate_case_report).parameters
+    if "use_cache" in accepted:
+        options["use_cache"] = not args.no_cache
+    elif args.no_cache:
+        raise SystemExit("report: --no-cache needs advanceCaseManager")
+
+    results = []
+    for case_id in read_ids(args.case_ids):
+        started = time.perf_counter()
+        failures = []
+        try:
+            with quiet(args):
+                path = manager.generate_case_report(case_id, failures=failures, **options)
+        except Exception as e:
+            results.append({"case_id": case_id, "ok": False, "error": str(e),
+                            "seconds": round(time.perf_counter() - started, 3)})
+            continue
+        seconds = round(time.perf_counter() - started, 3)
+        if path and failures:
+            results.append({"case_id": case_id, "ok": False, "path": path, "error": "; ".join(failures),
+                            "seconds": seconds})
+        elif path:
+            results.append({"case_id": case_id, "ok": True, "path": path, "seconds": seconds})
+        else:
+            results.append({"case_id": case_id, "ok": False, "error": "case not found", "seconds": seconds})
+    return results
+
+
+def cmd_batch(manager, args):
+    if args.ai and not manager.get_api_key():
+        raise SystemExit("batch: no OpenAI API key found (set OPENAI_API_KEY or use option 8 in the menu)")
+    if args.no_cache and "use_cache" not in inspect.signature(manager.generate_case_report).parameters:
+        raise SystemExit("batch: --no-cache needs advanceCaseManager")
+
+    if args.case_ids:
+        case_ids = read_ids(args.case_ids)
+    else:
+        case_ids = caseBatch.select_cases(
+            manager.BASE_DIR, status=args.status, payment_status=args.payment, created_from=args.created_from,
+            created_to=args.created_to, text=args.text, tag=args.tag,
+        )
+    with quiet(args):
+        summary = caseBatch.run_batch(
+            manager, case_ids, use_ai=args.ai, workers=args.workers,
+            on_existing="version" if args.new_version else "overwrite", use_cache=not args.no_cache,
+            progress=caseBatch.print_progress,
+        )
+    return {**summary, "ok": summary["failed"] == 0}
+
+
+COMMANDS = {
+    "create": cmd_create,
+    "intake": cmd_intake,
+    "list": cmd_list,
+    "show": cmd_show,
+    "update": cmd_update,
+    "tag": cmd_tag,
+    "migrate": cmd_migrate,
+    "delete": cmd_delete,
+    "report": cmd_report,
+    "batch": cmd_batch,
+}
+
+
+def build_parser(prog):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--compact", action="store_true", help="print JSON on a single line")
+    common.add_argument("--quiet", action="store_true", help="discard progress messages instead of sending them to stderr")
+
+    parser = argparse.ArgumentParser(prog=prog, description="Investigation Case Manager (non-interactive mode)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("create", parents=[common], help="create a case (case ID '-' reads JSON lines from stdin)")
+    p.add_argument("case_id")
+    p.add_argument("--status", choices=STATUSES, default="Open")
+    p.add_argument("--description", default="")
+    p.add_argument("--payment", choices=PAYMENT_STATUSES, default="Not Paid")
+    p.add_argument("--tag", action="append", default=[], help="tag the case (repeatable)")
+
+    p = sub.add_parser("intake", parents=[common], help="bulk-create cases from a CSV or JSONL file")
+    p.add_argument("file", help="CSV with a header row, or JSON lines (case_id, status, description, payment_status, tags)")
+    p.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension")
+    p.add_argument("--workers", type=int, default=caseIntake.INTAKE_WORKERS)
+    p.add_argument("--dry-run", action="store_true", help="validate every row without creating anything")
+
+    p = sub.add_parser("list", parents=[common], help="list cases from the index")
+    p.add_argument("--status", choices=STATUSES)
+    p.add_argument("--payment", choices=PAYMENT_STATUSES)
+    p.add_argument("--created-from", metavar="DATE", help="ISO date or timestamp, inclusive")
+    p.add_argument("--created-to", metavar="DATE", help="ISO date or timestamp, inclusive (a date covers the whole day)")
+    p.add_argument("--text", help="case-insensitive match on the description")
+    p.add_argument("--tag")
+    p.add_argument("--sort", choices=caseIndex.SORT_KEYS, default="case_id")
+    p.add_argument("--desc", action="store_true", help="sort descending")
+    p.add_argument("--limit", type=int, help="at most this many cases (default: all)")
+    p.add_argument("--offset", type=int, default=0, help="skip this many matching cases first")
+
+    p = sub.add_parser("show", parents=[common], help="case record, notes and folder contents")
+    p.add_argument("case_ids", nargs="+", metavar="case_id", help="'-' reads IDs from stdin")
+
+    p = sub.add_parser("update", parents=[common], help="set status and/or payment status")
+    p.add_argument("case_ids", nargs="+", metavar="case_id", help="'-' reads IDs from stdin")
+    p.add_argument("--status", choices=STATUSES)
+    p.add_argument("--payment", choices=PAYMENT_STATUSES)
+    p.add_argument("--expect-version", help="only update if the case is still at this version (from 'show')")
+
+    p = sub.add_parser("tag", parents=[common], help="add or remove tags")
+    p.add_argument("case_ids", nargs="+", metavar="case_id", help="'-' reads IDs from stdin")
+    p.add_argument("--add", action="append", default=[], metavar="TAG")
+    p.add_argument("--remove", action="append", default=[], metavar="TAG")
+    p.add_argument("--expect-version", help="only update if the case is still at this version (from 'show')")
+
+    p = sub.add_parser("migrate", parents=[common], help="write case.json for cases that only have a legacy notes.txt")
+
+    p = sub.add_parser("delete", parents=[common], help="delete cases")
+    p.add_argument("case_ids", nargs="+", metavar="case_id", help="'-' reads IDs from stdin")
+    p.add_argument("--yes", action="store_true", help="required: confirms deletion")
+
+    p = sub.add_parser("report", parents=[common], help="generate reports")
+    p.add_argument("case_ids", nargs="+", metavar="case_id", help="'-' reads IDs from stdin")
+    p.add_argument("--ai", action="store_true", help="AI-powered summaries")
+    p.add_argument("--no-cache", action="store_true", help="ignore cached AI responses and reusable report sections")
+    p.add_argument("--new-version", action="store_true", help="keep an existing report and write a timestamped copy")
+
+    p = sub.add_parser("batch", parents=[common], help="reports for every case matching the filters, in parallel")
+    p.add_argument("case_ids", nargs="*", metavar="case_id", help="explicit cases instead of filters ('-' reads stdin)")
+    p.add_argument("--status", choices=STATUSES)
+    p.add_argument("--payment", choices=PAYMENT_STATUSES)
+    p.add_argument("--created-from", metavar="DATE")
+    p.add_argument("--created-to", metavar="DATE")
+    p.add_argument("--text", help="case-insensitive match on the description")
+    p.add_argument("--tag")
+    p.add_argument("--ai", action="store_true", help="AI-powered summaries")
+    p.add_argument("--no-cache", action="store_true", help="ignore cached AI responses and reusable report sections")
+    p.add_argument("--new-version", action="store_true", help="keep existing reports and write timestamped copies")
+    p.add_argument("--workers", type=int, help=f"processes for traditional reports (default {caseBatch.BATCH_PROCESSES}), "
+                                              f"cases in flight for AI reports (default {caseBatch.BATCH_AI_CASES})")
+    return parser
+
+
+def run(manager, argv=None):
+    args = build_parser(os.path.basename(sys.argv[0])).parse_args(argv)
+    os.makedirs(manager.BASE_DIR, exist_ok=True)
+    caseIndex.ensure_index(manager.BASE_DIR)
+
+    result = COMMANDS[args.command](manager, args)
+    if isinstance(result, list):
+        ok = all(r["ok"] for r in result)
+        payload = {"command": args.command, "ok": ok, "results": result}
+    else:
+        ok = result.pop("ok", True)
+        payload = {"command": args.command, "ok": ok, **result}
+
+    print(json.dumps(payload, indent=None if args.compact else 2, ensure_ascii=False, default=str))
+    return 0 if ok else 1
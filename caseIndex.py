@@ -0,0 +1,397 @@
+import os
+import sqlite3
+import threading
+import time
+
+import caseMeta
+
+INDEX_FILENAME = ".index.db"
+INDEX_VERSION = "2"  # bump when the cases table is derived differently; forces a rebuild
+RECONCILE_INTERVAL = 10  # seconds between automatic stat passes
+METADATA_FILES = ("notes.txt", caseMeta.META_FILENAME)
+
+# Sort keys accepted by query_cases(); case_id breaks ties so pages are stable
+SORT_KEYS = ("case_id", "status", "payment_status", "created", "description")
+# query_cases() arguments that narrow the result (sort order does not)
+FILTER_KEYS = ("status", "payment_status", "created_from", "created_to", "text", "tag")
+
+# sqlite3 connections may only be used by the thread that opened them, so
+# each thread (e.g. a batch report worker) keeps its own per index file
+_local = threading.local()
+
+# Callbacks run by reconcile() for every added/modified/removed .md file:
+# handler(conn, case_id, rel_path, full_path) — full_path is None on removal.
+# Each handler is paired with a meta key recording that it has seen every file.
+FILE_HANDLERS = []
+HANDLER_KEYS = {}
+
+# Extra CREATE statements from modules that keep their own tables in the index
+SCHEMAS = []
+
+
+def index_path(base_dir):
+    return os.path.join(base_dir, INDEX_FILENAME)
+
+
+def _thread_connections():
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    return connections
+
+
+def get_connection(base_dir):
+    path = index_path(base_dir)
+    connections = _thread_connections()
+    conn = connections.get(path)
+    if conn is None:
+        os.makedirs(base_dir, exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS cases (
+                case_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL DEFAULT '',
+                description TEXT NOT NULL DEFAULT '',
+                payment_status TEXT NOT NULL DEFAULT '',
+                created TEXT NOT NULL DEFAULT '',
+                tags TEXT NOT NULL DEFAULT ''
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                case_id TEXT NOT NULL,
+                rel_path TEXT NOT NULL,
+                inode INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                PRIMARY KEY (case_id, rel_path)
+            );
+        """)
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(cases)")}
+        if "tags" not in columns:  # index created before tags existed
+            conn.execute("ALTER TABLE cases ADD COLUMN tags TEXT NOT NULL DEFAULT ''")
+        conn.executescript("""
+            CREATE INDEX IF NOT EXISTS cases_status ON cases (status, case_id);
+            CREATE INDEX IF NOT EXISTS cases_payment ON cases (payment_status, case_id);
+            CREATE INDEX IF NOT EXISTS cases_created ON cases (created, case_id);
+        """)
+        for schema in SCHEMAS:
+            conn.executescript(schema)
+        conn.commit()
+        connections[path] = conn
+    return conn
+
+
+def register_schema(schema):
+    if schema not in SCHEMAS:
+        SCHEMAS.append(schema)
+        for conn in _thread_connections().values():
+            conn.executescript(schema)
+
+
+def get_meta(conn, key):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row["value"] if row else None
+
+
+def set_meta(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+def _upsert(conn, case_id, record):
+    conn.execute(
+        "INSERT INTO cases (case_id, status, description, payment_status, created, tags) "
+        "VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(case_id) DO UPDATE SET status = excluded.status, "
+        "description = excluded.description, payment_status = excluded.payment_status, "
+        "created = excluded.created, tags = excluded.tags",
+        (case_id, record["status"], record["description"], record["payment_status"],
+         record["created"], ",".join(record["tags"]))
+    )
+
+
+def register_file_handler(handler, meta_key):
+    if handler not in FILE_HANDLERS:
+        FILE_HANDLERS.append(handler)
+    HANDLER_KEYS[handler] = meta_key
+
+
+def _signature(st):
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def scan_case(case_path):
+    # Stat notes.txt, case.json and every .md file below the case folder (hidden dirs such
+    # as .obsidian are skipped). The folder itself is stored under rel_path "".
+    found = {"": _signature(os.stat(case_path))}
+    stack = [("", case_path)]
+    while stack:
+        rel_dir, path = stack.pop()
+        try:
+            it = os.scandir(path)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((rel, entry.path))
+                    elif entry.is_file() and (rel in METADATA_FILES or entry.name.endswith(".md")):
+                        found[rel] = _signature(entry.stat())
+                except OSError:
+                    continue
+    return found
+
+
+def _stored_signatures(conn):
+    stored = {}
+    for row in conn.execute("SELECT case_id, rel_path, inode, size, mtime_ns FROM files"):
+        stored.setdefault(row["case_id"], {})[row["rel_path"]] = (row["inode"], row["size"], row["mtime_ns"])
+    return stored
+
+
+def _drop_file(conn, case_id, rel_path):
+    conn.execute("DELETE FROM files WHERE case_id = ? AND rel_path = ?", (case_id, rel_path))
+    if rel_path.endswith(".md"):
+        for handler in FILE_HANDLERS:
+            handler(conn, case_id, rel_path, None)
+
+
+def _drop_case(conn, case_id, rel_paths):
+    for rel_path in rel_paths:
+        _drop_file(conn, case_id, rel_path)
+    conn.execute("DELETE FROM cases WHERE case_id = ?", (case_id,))
+
+
+def reconcile(base_dir):
+    # Compare stored (inode, size, mtime_ns) signatures against the tree and
+    # re-parse only what changed. Returns counts of what was touched.
+    conn = get_connection(base_dir)
+    stored = _stored_signatures(conn)
+    known_cases = {row["case_id"] for row in conn.execute("SELECT case_id FROM cases")}
+    summary = {"cases_seen": 0, "files_changed": 0, "files_removed": 0, "cases_removed": 0}
+    seen = set()
+
+    if os.path.exists(base_dir):
+        with os.scandir(base_dir) as it:
+            entries = [e for e in it if e.name.startswith("Case_") and e.is_dir()]
+
+        for entry in entries:
+            case_id = entry.name.replace("Case_", "", 1)
+            try:
+                current = scan_case(entry.path)
+            except OSError:
+                continue
+            if not any(name in current for name in METADATA_FILES):
+                continue
+            seen.add(case_id)
+            summary["cases_seen"] += 1
+            previous = stored.get(case_id, {})
+
+            # A replaced case folder (new inode) invalidates everything under it
+            if previous.get("", (None,))[0] != current[""][0]:
+                previous = {}
+
+            for rel_path in previous.keys() - current.keys():
+                _drop_file(conn, case_id, rel_path)
+                summary["files_removed"] += 1
+
+            metadata_changed = False
+            for rel_path, sig in current.items():
+                if previous.get(rel_path) == sig:
+                    continue
+                conn.execute(
+                    "INSERT OR REPLACE INTO files (case_id, rel_path, inode, size, mtime_ns) VALUES (?, ?, ?, ?, ?)",
+                    (case_id, rel_path, *sig)
+                )
+                if rel_path == "":
+                    continue
+                summary["files_changed"] += 1
+                full_path = os.path.join(entry.path, rel_path)
+                if rel_path in METADATA_FILES:
+                    metadata_changed = True
+                else:
+                    for handler in FILE_HANDLERS:
+                        handler(conn, case_id, rel_path, full_path)
+
+            # One read per case however many of notes.txt/case.json changed;
+            # caseMeta.read never writes, so scanning a legacy tree is read-only
+            if metadata_changed or case_id not in known_cases:
+                try:
+                    record, _ = caseMeta.read(entry.path)
+                except OSError:
+                    record = None
+                if record is not None:
+                    _upsert(conn, case_id, record)
+
+    for case_id in (stored.keys() | known_cases) - seen:
+        _drop_case(conn, case_id, stored.get(case_id, {}).keys())
+        summary["cases_removed"] += 1
+
+    set_meta(conn, "built", "1")
+    set_meta(conn, "reconciled_at", str(time.time()))
+    conn.commit()
+    return summary
+
+
+def refresh_if_stale(base_dir, max_age=RECONCILE_INTERVAL):
+    conn = get_connection(base_dir)
+    last = get_meta(conn, "reconciled_at")
+    if last is None or time.time() - float(last) >= max_age:
+        return reconcile(base_dir)
+    return None
+
+
+def rebuild_index(base_dir):
+    # Full rescan — only needed on first run or if the index file is removed
+    conn = get_connection(base_dir)
+    conn.execute("DELETE FROM files")
+    conn.execute("DELETE FROM cases")
+    conn.commit()
+    summary = reconcile(base_dir)
+    for meta_key in HANDLER_KEYS.values():
+        set_meta(conn, meta_key, "1")
+    conn.commit()
+    return summary
+
+
+def record_case(base_dir, record):
+    # record is a caseMeta record, as returned by caseMeta.make_record/update_case
+    conn = get_connection(base_dir)
+    _upsert(conn, record["case_id"], record)
+    conn.commit()
+
+
+def record_cases(base_dir, records):
+    # Bulk form of record_case, written in a single transaction
+    conn = get_connection(base_dir)
+    for record in records:
+        _upsert(conn, record["case_id"], record)
+    conn.commit()
+
+
+def forget_case(base_dir, case_id):
+    conn = get_connection(base_dir)
+    rel_paths = [row["rel_path"] for row in conn.execute("SELECT rel_path FROM files WHERE case_id = ?", (case_id,))]
+    _drop_case(conn, case_id, rel_paths)
+    conn.commit()
+
+
+def ensure_index(base_dir):
+    conn = get_connection(base_dir)
+    if get_meta(conn, "built") is None or get_meta(conn, "index_version") != INDEX_VERSION:
+        rebuild_index(base_dir)
+        set_meta(conn, "index_version", INDEX_VERSION)
+        conn.commit()
+    return conn
+
+
+def ensure_handler_index(base_dir, handler):
+    # Make sure a registered file handler has seen every tracked .md file. On a
+    # fresh index the rebuild runs the handler itself; on an index created
+    # before the handler existed, replay the tracked files through it once.
+    conn = ensure_index(base_dir)
+    meta_key = HANDLER_KEYS[handler]
+    if get_meta(conn, meta_key) is None:
+        rows = conn.execute("SELECT case_id, rel_path FROM files WHERE rel_path LIKE '%.md'").fetchall()
+        for row in rows:
+            full_path = os.path.join(base_dir, f"Case_{row['case_id']}", row["rel_path"])
+            handler(conn, row["case_id"], row["rel_path"], full_path)
+        set_meta(conn, meta_key, "1")
+        conn.commit()
+    refresh_if_stale(base_dir)
+    return conn
+
+
+def _case_row(row):
+    case = dict(row)
+    case["tags"] = case["tags"].split(",") if case["tags"] else []
+    return case
+
+
+def load_cases(base_dir):
+    conn = ensure_index(base_dir)
+    refresh_if_stale(base_dir)
+    rows = conn.execute(
+        "SELECT case_id, status, description, payment_status, created, tags FROM cases ORDER BY case_id"
+    ).fetchall()
+    return [_case_row(row) for row in rows]
+
+
+def has_filters(query):
+    return any(query.get(key) for key in FILTER_KEYS)
+
+
+def _like_escape(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def query_cases(base_dir, status=None, payment_status=None, created_from=None, created_to=None,
+                text=None, tag=None, sort="case_id", descending=False, limit=None, offset=0, refresh=True):
+    # Filtered, sorted page of the cases table. Returns (cases on the page,
+    # number of cases matching the filters). created_from/created_to are ISO
+    # dates or timestamps; created_to includes everything it is a prefix of,
+    # so "2024-03-31" covers that whole day. text is a case-insensitive
+    # substring match on the description. refresh=False skips the stale
+    # check, for callers paging through a listing they reconciled once.
+    conn = ensure_index(base_dir)
+    if refresh:
+        refresh_if_stale(base_dir)
+
+    clauses = []
+    params = []
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+    if payment_status:
+        clauses.append("payment_status = ?")
+        params.append(payment_status)
+    if created_from:
+        clauses.append("created >= ?")
+        params.append(created_from.strip().replace(" ", "T"))
+    if created_to:
+        created_to = created_to.strip().replace(" ", "T")
+        clauses.append("substr(created, 1, ?) <= ?")
+        params.extend([len(created_to), created_to])
+    if text:
+        clauses.append("description LIKE ? ESCAPE '\\'")
+        params.append(f"%{_like_escape(text)}%")
+    if tag:
+        clauses.append("(',' || tags || ',') LIKE ? ESCAPE '\\'")
+        params.append(f"%,{_like_escape(tag)},%")
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    if sort not in SORT_KEYS:
+        raise ValueError(f"unknown sort key '{sort}'")
+    direction = "DESC" if descending else "ASC"
+    order = f"{sort} {direction}" if sort == "case_id" else f"{sort} {direction}, case_id {direction}"
+
+    total = conn.execute(f"SELECT COUNT(*) FROM cases{where}", params).fetchone()[0]
+    page_sql = ""
+    page_params = []
+    if limit is not None:
+        page_sql = " LIMIT ? OFFSET ?"
+        page_params = [max(0, int(limit)), max(0, int(offset))]
+    rows = conn.execute(
+        f"SELECT case_id, status, description, payment_status, created, tags FROM cases{where} "
+        f"ORDER BY {order}{page_sql}",
+        params + page_params
+    ).fetchall()
+    return [_case_row(row) for row in rows], total
+
+
+def get_case(base_dir, case_id):
+    conn = ensure_index(base_dir)
+    refresh_if_stale(base_dir)
+    row = conn.execute(
+        "SELECT case_id, status, description, payment_status, created, tags FROM cases WHERE case_id = ?", (case_id,)
+    ).fetchone()
+    return _case_row(row) if row else None
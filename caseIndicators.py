@@ -0,0 +1,158 @@
+import hashlib
+import re
+
+import caseIndex
+
+# One alternation, one pass per line. Order matters: URLs are tried before the
+# bare patterns so an address inside an explorer link is caught by the nested
+# scan of the URL below rather than split in half.
+INDICATOR_RE = re.compile(r"""
+    (?P<url>\bhttps?://[^\s<>()\[\]"'`]+)
+  | (?P<email>\b[\w.+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,})
+  | (?P<eth>\b0x[a-fA-F0-9]{40}\b)
+  | (?P<btc>\bbc1[ac-hj-np-z02-9]{11,71}\b|\b[13][a-km-zA-HJ-NP-Z1-9]{25,34}\b)
+  | (?P<tron>\bT[1-9A-HJ-NP-Za-km-z]{33}\b)
+  | (?P<handle>(?<![\w@/])@[A-Za-z0-9_]{2,30}\b)
+""", re.VERBOSE)
+
+ADDRESS_RE = re.compile(r"""
+    (?P<eth>\b0x[a-fA-F0-9]{40}\b)
+  | (?P<btc>\bbc1[ac-hj-np-z02-9]{11,71}\b|\b[13][a-km-zA-HJ-NP-Z1-9]{25,34}\b)
+  | (?P<tron>\bT[1-9A-HJ-NP-Za-km-z]{33}\b)
+""", re.VERBOSE)
+
+MAX_RESULTS = 200
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+BECH32_ALPHABET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+BECH32_CONSTANTS = (1, 0x2BC830A3)  # bech32 (segwit v0) and bech32m (taproot)
+
+caseIndex.register_schema("""
+    CREATE TABLE IF NOT EXISTS indicators (
+        value TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        case_id TEXT NOT NULL,
+        rel_path TEXT NOT NULL,
+        line_no INTEGER NOT NULL,
+        PRIMARY KEY (value, case_id, rel_path, line_no)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS indicators_by_file ON indicators (case_id, rel_path);
+""")
+
+
+def _base58check_ok(value):
+    # Legacy (1...) and P2SH (3...) addresses: 25 bytes, the last 4 a double-SHA256 checksum
+    number = 0
+    for char in value:
+        number = number * 58 + BASE58_ALPHABET.index(char)
+    try:
+        raw = number.to_bytes(25, "big")
+    except OverflowError:
+        return False
+    return hashlib.sha256(hashlib.sha256(raw[:-4]).digest()).digest()[:4] == raw[-4:]
+
+
+def _bech32_ok(value):
+    # Native segwit (bc1...) addresses: BIP-173/BIP-350 polymod checksum
+    value = value.lower()
+    data = [BECH32_ALPHABET.index(char) for char in value[3:]]
+    checksum = 1
+    for v in [3, 3, 0, 2, 3] + data:  # "bc" expanded to its high and low bits
+        top = checksum >> 25
+        checksum = (checksum & 0x1FFFFFF) << 5 ^ v
+        for i, gen in enumerate((0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)):
+            if (top >> i) & 1:
+                checksum ^= gen
+    return checksum in BECH32_CONSTANTS
+
+
+def valid_btc(value):
+    # The pattern alone also matches long digit runs (invoice or phone numbers),
+    # so only checksummed addresses are indexed
+    if value.lower().startswith("bc1"):
+        return _bech32_ok(value)
+    return _base58check_ok(value)
+
+
+def normalize(kind, value):
+    if kind == "url":
+        return value.rstrip(".,;:!?*_~")
+    if kind in ("eth", "email", "handle") or value.startswith("bc1"):
+        return value.lower()
+    return value
+
+
+def extract_indicators(text):
+    # Yields (kind, normalized value) pairs for a single line of text
+    for match in INDICATOR_RE.finditer(text):
+        kind = match.lastgroup
+        value = normalize(kind, match.group(kind))
+        if kind == "btc" and not valid_btc(value):
+            continue
+        yield kind, value
+        if kind == "url":
+            for inner in ADDRESS_RE.finditer(value):
+                inner_kind = inner.lastgroup
+                inner_value = normalize(inner_kind, inner.group(inner_kind))
+                if inner_kind != "btc" or valid_btc(inner_value):
+                    yield inner_kind, inner_value
+
+
+def classify(value):
+    # Work out the kind of a user-supplied lookup value
+    value = value.strip()
+    match = INDICATOR_RE.fullmatch(value)
+    if match and (match.lastgroup != "btc" or valid_btc(value)):
+        return match.lastgroup, normalize(match.lastgroup, value)
+    return None, value
+
+
+def index_file(conn, case_id, rel_path, full_path):
+    # Registered with caseIndex: called for every added/changed/removed .md file
+    conn.execute("DELETE FROM indicators WHERE case_id = ? AND rel_path = ?", (case_id, rel_path))
+    if full_path is None:
+        return
+    rows = []
+    try:
+        with open(full_path, "r", errors="replace") as f:
+            for line_no, line in enumerate(f, start=1):
+                for kind, value in extract_indicators(line):
+                    rows.append((value, kind, case_id, rel_path, line_no))
+    except OSError:
+        return
+    conn.executemany("INSERT OR IGNORE INTO indicators VALUES (?, ?, ?, ?, ?)", rows)
+
+
+# Versioned key: indexes built before BTC checksums were checked are replayed once
+caseIndex.register_file_handler(index_file, "indicators_built_v2")
+
+
+def ensure_indicator_index(base_dir):
+    return caseIndex.ensure_handler_index(base_dir, index_file)
+
+
+def lookup(base_dir, value, limit=MAX_RESULTS):
+    kind, value = classify(value)
+    conn = ensure_indicator_index(base_dir)
+    rows = conn.execute(
+        "SELECT value, kind, case_id, rel_path, line_no FROM indicators WHERE value = ? "
+        "ORDER BY case_id, rel_path, line_no LIMIT ?",
+        (value, limit)
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def shared_indicators(base_dir, case_id=None, limit=MAX_RESULTS):
+    # Indicators seen in more than one case, optionally only those touching case_id
+    conn = ensure_indicator_index(base_dir)
+    sql = (
+        "SELECT value, kind, COUNT(DISTINCT case_id) AS case_count, "
+        "GROUP_CONCAT(DISTINCT case_id) AS cases FROM indicators "
+    )
+    params = []
+    if case_id is not None:
+        sql += "WHERE value IN (SELECT value FROM indicators WHERE case_id = ?) "
+        params.append(case_id)
+    sql += "GROUP BY value HAVING case_count > 1 ORDER BY case_count DESC, value LIMIT ?"
+    params.append(limit)
+    return [dict(row) for row in conn.execute(sql, params).fetchall()]
@@ -0,0 +1,167 @@
+import csv
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import caseIndex
+import caseMeta
+from caseMeta import STATUSES, PAYMENT_STATUSES
+
+INTAKE_WORKERS = 8  # folder provisioning is I/O-bound, so threads overlap well
+
+# Header spellings accepted in intake files, mapped to record keys
+FIELD_ALIASES = {
+    "case_id": "case_id",
+    "case id": "case_id",
+    "id": "case_id",
+    "status": "status",
+    "description": "description",
+    "payment_status": "payment_status",
+    "payment status": "payment_status",
+    "payment": "payment_status",
+    "tags": "tags",
+}
+
+
+def valid_case_id(case_id):
+    # Case IDs become folder names: no path separators, no hidden or relative names
+    return (
+        bool(case_id)
+        and case_id == case_id.strip()
+        and not case_id.startswith(".")
+        and "/" not in case_id
+        and os.sep not in case_id
+    )
+
+
+def normalize_record(raw):
+    record = {}
+    for key, value in raw.items():
+        field = FIELD_ALIASES.get(str(key).strip().lower())
+        if field == "tags" and field not in record:
+            record[field] = caseMeta.parse_tags(value)  # "a, b" in CSV, a list in JSONL
+        elif field and field not in record:
+            record[field] = "" if value is None else str(value).strip()
+    return {
+        "case_id": record.get("case_id", ""),
+        # Spelled however the file likes ("open", "PAID"); validate_record sees the canonical form
+        "status": caseMeta.canonical_option(record.get("status") or "Open", STATUSES),
+        "description": record.get("description", ""),
+        "payment_status": caseMeta.canonical_option(record.get("payment_status") or "Not Paid", PAYMENT_STATUSES),
+        "tags": record.get("tags", []),
+    }
+
+
+def validate_record(record):
+    # Returns an error message, or None when the record can be created
+    if not valid_case_id(record["case_id"]):
+        return "invalid case ID"
+    if record["status"] not in STATUSES:
+        return f"invalid status '{record['status']}'"
+    if record["payment_status"] not in PAYMENT_STATUSES:
+        return f"invalid payment status '{record['payment_status']}'"
+    return None
+
+
+def read_rows(path, fmt=None):
+    # Yields (row number, record or None, parse error or None) for a CSV or JSONL file
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        if fmt == "csv":
+            for row_no, raw in enumerate(csv.DictReader(f), start=1):
+                yield row_no, normalize_record(raw), None
+        else:
+            row_no = 0
+            for line in f:
+                if not line.strip():
+                    continue
+                row_no += 1
+                try:
+                    raw = json.loads(line)
+                except ValueError as e:
+                    yield row_no, None, f"invalid JSON ({e})"
+                    continue
+                if not isinstance(raw, dict):
+                    yield row_no, None, "expected a JSON object"
+                    continue
+                yield row_no, normalize_record(raw), None
+
+
+def plan_intake(base_dir, rows):
+    # Validate every row before anything touches disk: field checks, duplicate
+    # IDs inside the file, and IDs that already have a case folder.
+    existing = set()
+    if os.path.isdir(base_dir):
+        with os.scandir(base_dir) as it:
+            existing = {e.name[len("Case_"):] for e in it if e.name.startswith("Case_")}
+
+    accepted, rejected = [], []
+    seen = {}
+    for row_no, record, error in rows:
+        if error is None:
+            error = validate_record(record)
+        if error is None and record["case_id"] in seen:
+            error = f"duplicate of row {seen[record['case_id']]}"
+        if error is None and record["case_id"] in existing:
+            error = "case already exists"
+        if error is None:
+            seen[record["case_id"]] = row_no
+            accepted.append((row_no, record))
+        else:
+            rejected.append({"row": row_no, "case_id": record["case_id"] if record else None,
+                             "ok": False, "error": error})
+    return accepted, rejected
+
+
+def provision_all(manager, accepted, workers=INTAKE_WORKERS):
+    # Create folders on a thread pool, then record every new case in the
+    # index in one transaction from this thread (SQLite connections stay put).
+    def provision(row_no, record):
+        started = time.perf_counter()
+        try:
+            case_folder, meta = manager.provision_case(
+                record["case_id"], record["status"], record["description"], record["payment_status"],
+                record["tags"]
+            )
+        except FileExistsError:
+            return {"row": row_no, "case_id": record["case_id"], "ok": False, "error": "case already exists"}, None
+        except OSError as e:
+            # The folder is new (FileExistsError is handled above): remove what was
+            # built so the index never sees it and a retry is not "already exists"
+            shutil.rmtree(os.path.join(manager.BASE_DIR, f"Case_{record['case_id']}"), ignore_errors=True)
+            return {"row": row_no, "case_id": record["case_id"], "ok": False, "error": str(e)}, None
+        result = {"row": row_no, "case_id": record["case_id"], "ok": True, "path": case_folder,
+                  "seconds": round(time.perf_counter() - started, 4)}
+        return result, meta
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        outcomes = list(pool.map(lambda item: provision(*item), accepted))
+
+    caseIndex.record_cases(manager.BASE_DIR, [meta for result, meta in outcomes if result["ok"]])
+    return [result for result, _ in outcomes]
+
+
+def bulk_intake(manager, path, fmt=None, workers=INTAKE_WORKERS, dry_run=False):
+    # Returns (per-row results in file order, summary dict)
+    started = time.perf_counter()
+    os.makedirs(manager.BASE_DIR, exist_ok=True)
+    accepted, rejected = plan_intake(manager.BASE_DIR, read_rows(path, fmt))
+
+    if dry_run:
+        created = [{"row": row_no, "case_id": record["case_id"], "ok": True, "dry_run": True}
+                   for row_no, record in accepted]
+    else:
+        created = provision_all(manager, accepted, workers)
+
+    results = sorted(rejected + created, key=lambda r: r["row"])
+    summary = {
+        "rows": len(results),
+        "created": sum(1 for r in created if r["ok"] and not dry_run),
+        "failed": sum(1 for r in results if not r["ok"]),
+        "workers": workers,
+        "dry_run": dry_run,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    return results, summary
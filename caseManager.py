@@ -1,17 +1,22 @@
-import re
 import subprocess
+import sys
 from colorama import init, Fore, Style
-import markdown2
-from weasyprint import HTML
 import os
-from openai import OpenAI
 import shutil
 from datetime import datetime
 from tabulate import tabulate
-from tqdm import tqdm
-from dotenv import load_dotenv, set_key, unset_key
+import caseBatch
+import caseIndex
+import caseMeta
+import caseNotes
+import casePager
+import caseSearch
+import caseIndicators
+import vaultTemplate
+import aiClient
 
 BASE_DIR = os.path.expanduser("~/Investigations")
+CASES_PER_PAGE = 20  # rows per page in List Cases and the case picker
 
 init(autoreset=True) 
 
@@ -25,11 +30,13 @@ SUBFOLDERS = [
 ]
 
 def get_api_key():
+    from dotenv import load_dotenv  # loaded on first use to keep startup fast
     load_dotenv(dotenv_path=os.path.join(BASE_DIR, ".env"))
     return os.getenv("OPENAI_API_KEY")
 
 
 def manage_api_key():
+    from dotenv import load_dotenv, set_key, unset_key
     env_path = os.path.join(BASE_DIR, ".env")
     load_dotenv(dotenv_path=env_path)
 
@@ -49,11 +56,15 @@ def manage_api_key():
         new_key = input("Enter new OpenAI API Key: ").strip()
         if new_key.startswith("sk-") and len(new_key) > 20:
             set_key(env_path, "OPENAI_API_KEY", new_key)
+            os.environ["OPENAI_API_KEY"] = new_key
+            aiClient.reset_client()
             print("✅ API key updated.")
         else:
             print("❌ Invalid API key format.")
     elif choice == "2":
         unset_key(env_path, "OPENAI_API_KEY")
+        os.environ.pop("OPENAI_API_KEY", None)
+        aiClient.reset_client()
         print("✅ API key cleared.")
     elif choice == "3":
         return
@@ -61,11 +72,10 @@ def manage_api_key():
         print("❌ Invalid choice.")
 
 
-def create_case(case_id, status, description, payment_status="Not Paid"):
+def provision_case(case_id, status, description, payment_status="Not Paid", tags=()):
+    # Folders, templates, case.json/notes.txt and vault settings — no index or UI work, so
+    # bulk intake can run this from worker threads. Raises FileExistsError if taken.
     case_folder = os.path.join(BASE_DIR, f"Case_{case_id}")
-    if os.path.exists(case_folder):
-        print(f"❌ Case {case_id} already exists.")
-        return
     os.makedirs(case_folder)
 
     for sub in SUBFOLDERS:
@@ -75,62 +85,142 @@ def create_case(case_id, status, description, payment_status="Not Paid"):
         with open(md_path, "w") as md_file:
             md_file.write(f"# {sub}\n")
 
-    with open(os.path.join(case_folder, "notes.txt"), "w") as f:
-        f.write(f"Case ID: {case_id}\n")
-        f.write(f"Status: {status}\n")
-        f.write(f"Description: {description}\n")
-        f.write(f"Payment Status: {payment_status}\n")
-        f.write(f"Created: {datetime.now()}\n")
-
-    print(f"✅ Case {case_id} created successfully.")
-
-    try:
-        # ✅ Open directly to '0. Introduction.md' using Obsidian
-        intro_md = os.path.join(case_folder, "0. Introduction", "0. Introduction.md")
-        subprocess.run(["open", "-a", "Obsidian", intro_md])
-
-        print(f"\n🚀 Obsidian has been opened.")
-        print("📌 To begin working with this case as a vault:")
-        print(f"1. In Obsidian, click 'Open folder as vault'")
-        print(f"2. Select: {case_folder}")
-        print(f"3. (Optional) Enable plugins or templates specific to this case.\n")
-    except Exception as e:
-        print(f"⚠️ Could not open in Obsidian: {e}")
+    # 🗂️ case.json holds the typed record; notes.txt is rendered from it
+    record = caseMeta.make_record(case_id, status, description, payment_status, tags=tags)
+    caseMeta.save(case_folder, record)
 
     VAULT_TEMPLATE = os.path.expanduser("~/vault_template/.obsidian")
 
     if os.path.exists(VAULT_TEMPLATE):
         try:
-            shutil.copytree(VAULT_TEMPLATE, os.path.join(case_folder, ".obsidian"))
+            # Reflinks/hardlinks where possible; only files Obsidian edits are real copies
+            vaultTemplate.provision(VAULT_TEMPLATE, os.path.join(case_folder, ".obsidian"))
             print("📦 Obsidian vault settings applied to new case.")
         except FileExistsError:
             print("⚠️ .obsidian folder already exists in this case. Skipping template.")
 
+    return case_folder, record
+
+
+def create_case(case_id, status, description, payment_status="Not Paid", open_obsidian=True, tags=()):
+    case_folder = os.path.join(BASE_DIR, f"Case_{case_id}")
+    if os.path.exists(case_folder):
+        print(f"❌ Case {case_id} already exists.")
+        return None
+    case_folder, record = provision_case(case_id, status, description, payment_status, tags)
+    caseIndex.record_case(BASE_DIR, record)
+
+    print(f"✅ Case {case_id} created successfully.")
+
+    if open_obsidian:
+        try:
+            # ✅ Open directly to '0. Introduction.md' using Obsidian
+            intro_md = os.path.join(case_folder, "0. Introduction", "0. Introduction.md")
+            subprocess.run(["open", "-a", "Obsidian", intro_md])
+
+            print(f"\n🚀 Obsidian has been opened.")
+            print("📌 To begin working with this case as a vault:")
+            print(f"1. In Obsidian, click 'Open folder as vault'")
+            print(f"2. Select: {case_folder}")
+            print(f"3. (Optional) Enable plugins or templates specific to this case.\n")
+        except Exception as e:
+            print(f"⚠️ Could not open in Obsidian: {e}")
+
+    return case_folder
+
+
 
+def show_case_page(page=1, refresh=True, **query):
+    # Filter, sort and slice in the index; only the visible page is formatted.
+    # Returns (case IDs on the page, number of matching cases).
+    first = (page - 1) * CASES_PER_PAGE
+    cases, total = caseIndex.query_cases(BASE_DIR, limit=CASES_PER_PAGE, offset=first, refresh=refresh, **query)
+    if total == 0:
+        print("📁 No cases match these filters." if caseIndex.has_filters(query) else "📁 No cases found.")
+        return [], 0
 
-def list_cases(return_data=False):
+    table = []
+    for n, case in enumerate(cases, start=first + 1):
+        table.append([n, case["case_id"], case["status"], case["description"], case["payment_status"]])
+    print(tabulate(table, headers=["#", "Case ID", "Status", "Description", "Payment Status"], tablefmt="fancy_grid"))
+    print(f"📄 Page {page} of {max(1, -(-total // CASES_PER_PAGE))} — {total} case(s)")
+    return [case["case_id"] for case in cases], total
+
+
+def list_cases(return_data=False, page=1, **query):
+    # query: status, payment_status, created_from, created_to, text, tag, sort, descending
     if not os.path.exists(BASE_DIR):
         print("📁 No cases found.")
         return [] if return_data else None
 
-    table = []
-    case_data = []
-    for folder in os.listdir(BASE_DIR):
-        case_path = os.path.join(BASE_DIR, folder)
-        notes_file = os.path.join(case_path, "notes.txt")
-        if os.path.exists(notes_file):
-            with open(notes_file, "r") as f:
-                lines = f.readlines()
-                status = next((line.split(":")[1].strip() for line in lines if line.startswith("Status:")), "")
-                description = next((line.split(":")[1].strip() for line in lines if line.startswith("Description:")), "")
-                case_id = folder.replace("Case_", "")
-                payment_status = next((line.split(":")[1].strip() for line in lines if line.startswith("Payment Status:")), "")
-                table.append([len(case_data)+1, case_id, status, description, payment_status])
-                case_data.append(case_id)
-
-    print(tabulate(table, headers=["#", "Case ID", "Status", "Description", "Payment Status"], tablefmt="fancy_grid"))
+    case_data, _ = show_case_page(page, **query)
     return case_data if return_data else None
 
+
+def ask_case_filters():
+    # Filters for browse_cases(); an empty answer leaves that field unfiltered
+    filters = {}
+    status = input("Status — 1. Open  2. Closed  (Enter for any): ").strip()
+    filters["status"] = {"1": "Open", "2": "Closed"}.get(status)
+    payment = input("Payment — 1. Not Paid  2. Partial Payment  3. Paid  (Enter for any): ").strip()
+    filters["payment_status"] = {"1": "Not Paid", "2": "Partial Payment", "3": "Paid"}.get(payment)
+    filters["created_from"] = input("Created from (YYYY-MM-DD, Enter for any): ").strip() or None
+    filters["created_to"] = input("Created up to (YYYY-MM-DD, Enter for any): ").strip() or None
+    filters["text"] = input("Description contains (Enter for any): ").strip() or None
+    filters["tag"] = input("Tag (Enter for any): ").strip() or None
+    return filters
+
+
+def ask_case_sort():
+    keys = {"1": "case_id", "2": "created", "3": "status", "4": "payment_status"}
+    print("Sort by: 1. Case ID  2. Created  3. Status  4. Payment Status")
+    sort = keys.get(input("Enter choice: ").strip(), "case_id")
+    descending = input("Newest/highest first? (y/N): ").strip().lower() == "y"
+    return {"sort": sort, "descending": descending}
+
+
+def browse_cases(select=False):
+    # Page through the index with filters and sorting. With select=True,
+    # returns the case ID picked by its number (or None).
+    query = {}
+    page = 1
+    # Refresh (throttled) once when the listing opens; page turns and filter
+    # changes then only query the index
+    caseIndex.ensure_index(BASE_DIR)
+    caseIndex.refresh_if_stale(BASE_DIR)
+    while True:
+        case_ids, total = show_case_page(page, refresh=False, **query)
+        if total == 0 and not caseIndex.has_filters(query):
+            return None
+        pages = max(1, -(-total // CASES_PER_PAGE))
+        actions = "[n]ext  [p]rev  [f]ilter  [s]ort  [c]lear filters"
+        if select:
+            actions += "  or a case number"
+        choice = input(f"{actions}  (Enter to go back): ").strip().lower()
+
+        if not choice:
+            return None
+        elif choice == "n":
+            page = min(pages, page + 1)
+        elif choice == "p":
+            page = max(1, page - 1)
+        elif choice == "f":
+            query.update(ask_case_filters())
+            page = 1
+        elif choice == "s":
+            query.update(ask_case_sort())
+            page = 1
+        elif choice == "c":
+            query = {key: value for key, value in query.items() if key in ("sort", "descending")}
+            page = 1
+        elif select and choice.isdigit():
+            position = int(choice) - (page - 1) * CASES_PER_PAGE - 1
+            if 0 <= position < len(case_ids):
+                return case_ids[position]
+            print("❌ Invalid selection. Pick a number shown on this page.")
+        else:
+            print("❌ Invalid choice.")
+
 import os
 from datetime import datetime
 
@@ -177,12 +267,7 @@ def view_case(case_id):
                         first_line = md_file.readline().strip()
                         if first_line:
                             # 🔗 Shorten URLs in preview line
-                            urls = re.findall(r'(https?://[^\s)]+)', first_line)
-                            for url in urls:
-                                if len(url) > 30:
-                                    short_url = url[:30] + "..."
-                                    first_line = first_line.replace(url, short_url)
-                            preview = f" - 📝 {first_line}"
+                            preview = f" - 📝 {casePager.shorten_urls(first_line)}"
                             break
             print(f"📁 {sub:<25} {num_files} file{'s' if num_files != 1 else ''} | Last Modified: {last_mod}{preview}")
             folder_map[sub] = [os.path.join(sub_path, f) for f in files if f.endswith(".md")]
@@ -195,61 +280,44 @@ def view_case(case_id):
         print("↩️ Returning to main menu.")
         return
 
-    print("\n💡 " + Style.BRIGHT + "Deep Dive Into Case Notes:\n")
+    print("\n💡 " + Style.BRIGHT + "Deep Dive Into Case Notes:")
 
-    for folder, md_files in folder_map.items():
-        print(Fore.CYAN + Style.BRIGHT + f"=== {folder} ===")
-        for md_file in md_files:
-            print(Fore.YELLOW + f"\n📄 {os.path.basename(md_file)}")
-            with open(md_file, "r") as f:
-                for line in f:
-                    line = line.rstrip()
-                    if line.startswith("#"):
-                        print(Fore.GREEN + Style.BRIGHT + line)
-                    elif line.strip():
-                        # 🔗 Truncate URLs in the line
-                        urls = re.findall(r'(https?://[^\s)]+)', line)
-                        for url in urls:
-                            if len(url) > 30:
-                                short_url = url[:30] + "..."
-                                line = line.replace(url, short_url)
-                        print(Fore.WHITE + line)
-            print("\n" + "-" * 40)
+    # 📖 One page at a time, read lazily; jump between sections and files
+    casePager.page_through(list(folder_map.items()))
 
     print("\n✅ Deep dive complete.")
 
 
-def update_status(case_id, new_status):
-    notes_file = os.path.join(BASE_DIR, f"Case_{case_id}", "notes.txt")
-    if not os.path.exists(notes_file):
+def update_status(case_id, new_status, expected_version=None):
+    case_path = os.path.join(BASE_DIR, f"Case_{case_id}")
+    if not os.path.exists(os.path.join(case_path, "notes.txt")):
         print(f"❌ Case {case_id} not found.")
-        return
-    with open(notes_file, "r") as f:
-        lines = f.readlines()
-    with open(notes_file, "w") as f:
-        for line in lines:
-            if line.startswith("Status:"):
-                f.write(f"Status: {new_status}\n")
-            else:
-                f.write(line)
+        return False
+    try:
+        # 🔒 Locked, atomic rewrite; refuses if the case moved past revision expected_version
+        record = caseMeta.update_case(case_path, {"status": new_status}, expected_version)
+    except caseNotes.NotesConflict:
+        print(f"❌ Case {case_id} was changed by someone else in the meantime. Reload it and try again.")
+        return False
+    caseIndex.record_case(BASE_DIR, record)
     print(f"✅ Status updated for Case {case_id}.")
+    return True
 
-def update_status_and_payment(case_id, new_status, new_payment_status):
-    notes_file = os.path.join(BASE_DIR, f"Case_{case_id}", "notes.txt")
-    if not os.path.exists(notes_file):
+def update_status_and_payment(case_id, new_status, new_payment_status, expected_version=None):
+    case_path = os.path.join(BASE_DIR, f"Case_{case_id}")
+    if not os.path.exists(os.path.join(case_path, "notes.txt")):
         print(f"❌ Case {case_id} not found.")
-        return
-    with open(notes_file, "r") as f:
-        lines = f.readlines()
-    with open(notes_file, "w") as f:
-        for line in lines:
-            if line.startswith("Status:"):
-                f.write(f"Status: {new_status}\n")
-            elif line.startswith("Payment Status:"):
-                f.write(f"Payment Status: {new_payment_status}\n")
-            else:
-                f.write(line)
+        return False
+    try:
+        record = caseMeta.update_case(
+            case_path, {"status": new_status, "payment_status": new_payment_status}, expected_version
+        )
+    except caseNotes.NotesConflict:
+        print(f"❌ Case {case_id} was changed by someone else in the meantime. Reload it and try again.")
+        return False
+    caseIndex.record_case(BASE_DIR, record)
     print(f"✅ Status and payment updated for Case {case_id}.")
+    return True
 
 def open_case_in_obsidian(case_id):
     case_path = os.path.join(BASE_DIR, f"Case_{case_id}")
@@ -264,29 +332,63 @@ def open_case_in_obsidian(case_id):
         print(f"⚠️ Could not open Obsidian: {e}")
 
 def select_case():
-    case_list = list_cases(return_data=True)
-    if not case_list:
-        return None
-    try:
-        choice = int(input("Select case by number: "))
-        if 1 <= choice <= len(case_list):
-            return case_list[choice - 1]
-        else:
-            print("❌ Invalid selection.")
-            return None
-    except ValueError:
-        print("❌ Invalid input. Please enter a number.")
-        return None
+    return browse_cases(select=True)
+
+def search_cases():
+    query = input("🔎 Enter search terms: ").strip()
+    if not query:
+        print("❌ Search query cannot be empty.")
+        return
+
+    start = time.perf_counter()
+    results = caseSearch.search(BASE_DIR, query)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if not results:
+        print(f"📭 No matches for '{query}'.")
+        return
+
+    table = []
+    for r in results:
+        text = r["text"] if len(r["text"]) <= 80 else r["text"][:77] + "..."
+        table.append([r["case_id"], r["path"], r["line"], text])
+    print(tabulate(table, headers=["Case ID", "File", "Line", "Text"], tablefmt="fancy_grid"))
+    print(f"🔎 {len(results)} match{'es' if len(results) != 1 else ''} in {elapsed_ms:.1f} ms")
+
+def lookup_indicator():
+    value = input("🧭 Enter wallet/URL/email/@handle (blank = show indicators shared across cases): ").strip()
+
+    if not value:
+        shared = caseIndicators.shared_indicators(BASE_DIR)
+        if not shared:
+            print("📭 No indicators appear in more than one case.")
+            return
+        table = [[s["kind"], s["value"], s["case_count"], s["cases"]] for s in shared]
+        print(tabulate(table, headers=["Type", "Indicator", "Cases", "Case IDs"], tablefmt="fancy_grid"))
+        return
 
-def delete_case(case_id):
+    hits = caseIndicators.lookup(BASE_DIR, value)
+    if not hits:
+        print(f"📭 '{value}' does not appear in any case.")
+        return
+
+    case_ids = sorted({h["case_id"] for h in hits})
+    table = [[h["case_id"], h["rel_path"], h["line_no"]] for h in hits]
+    print(tabulate(table, headers=["Case ID", "File", "Line"], tablefmt="fancy_grid"))
+    print(f"🧭 Found in {len(case_ids)} case{'s' if len(case_ids) != 1 else ''}: {', '.join(case_ids)}")
+
+def delete_case(case_id, confirm=True):
     case_folder = os.path.join(BASE_DIR, f"Case_{case_id}")
     if os.path.exists(case_folder):
-        confirm = input(f"⚠️ Are you sure you want to delete Case {case_id}? (yes/no): ")
-        if confirm.lower() == "yes":
+        answer = input(f"⚠️ Are you sure you want to delete Case {case_id}? (yes/no): ") if confirm else "yes"
+        if answer.lower() == "yes":
             shutil.rmtree(case_folder)
+            caseIndex.forget_case(BASE_DIR, case_id)
             print(f"🗑️ Case {case_id} deleted.")
+            return True
     else:
         print(f"❌ Case {case_id} not found.")
+    return False
 
 def generate_summary_for_section(section_name, text, use_ai=False):
     if not text.strip():
@@ -306,33 +408,33 @@ def generate_summary_for_section(section_name, text, use_ai=False):
         return "\n".join(bullet_points) if bullet_points else "_No summary available._"
 
     try:
-        # 🔑 Ensure your API key is set in environment variable
-        client = OpenAI(api_key=get_api_key())
-    
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": (
-                    "You are an AI assistant helping generate a formal investigation report for law enforcement. "
-                    f"Summarize this section: '{section_name}' with professionalism and clarity. "
-                    "Use bullet points or a short summary paragraph. Avoid speculation."
-                )},
-                {"role": "user", "content": text}
-            ],
-            temperature=0.3
+        # 🔑 One shared, pooled client for the whole process (built on first use)
+        client = aiClient.get_client(get_api_key)
+        system_prompt = (
+            "You are an AI assistant helping generate a formal investigation report for law enforcement. "
+            f"Summarize this section: '{section_name}' with professionalism and clarity. "
+            "Use bullet points or a short summary paragraph. Avoid speculation."
+        )
+        # No tokenizer here: ~4 characters per token is close enough for the rate limiter
+        return aiClient.chat_completion(
+            client, system_prompt, text,
+            model="gpt-4", temperature=0.3,
+            token_count=len(system_prompt + text) // 4
         )
-        return response.choices[0].message.content.strip()
 
     except Exception as e:
         return f"_AI summary failed: {e}_"
 
-from tqdm import tqdm
 import time  # Optional for simulating processing time
 
-def generate_case_report(case_id, use_ai=False):
+def generate_case_report(case_id, use_ai=False, prompt=True, on_existing="overwrite", failures=None):
+    # failures: optional list that collects a note for every AI summary that failed
     case_path = os.path.join(BASE_DIR, f"Case_{case_id}")
     notes_file = os.path.join(case_path, "notes.txt")
     report_folder = os.path.join(case_path, "4. Report")
+    if not os.path.exists(notes_file):
+        print(f"❌ Case {case_id} not found.")
+        return None
     os.makedirs(report_folder, exist_ok=True)
     default_filename = f"Case_{case_id}_Report.md"
     md_output_path = os.path.join(report_folder, default_filename)
@@ -340,13 +442,16 @@ def generate_case_report(case_id, use_ai=False):
     # Handle existing report
     if os.path.exists(md_output_path):
         print(f"⚠️ A report already exists for Case {case_id}: {default_filename}")
-        choice = input("Do you want to overwrite (o) or save as a new version (n)? [o/n]: ").strip().lower()
+        if prompt:
+            choice = input("Do you want to overwrite (o) or save as a new version (n)? [o/n]: ").strip().lower()
+        else:
+            choice = "n" if on_existing == "version" else "o"
         if choice == "n":
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             md_output_path = os.path.join(report_folder, f"Case_{case_id}_Report_{timestamp}.md")
         elif choice != "o":
             print("❌ Invalid input. Cancelling report generation.")
-            return
+            return None
 
     report_md = f"# 🕵️‍♂️ INVESTIGATION REPORT: Case {case_id}\n"
     report_md += f"**Date Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
@@ -360,10 +465,10 @@ def generate_case_report(case_id, use_ai=False):
             report_md += f"```\n{notes.strip()}\n```\n\n---\n"
 
     # Build section content with progress bar
+    from tqdm import tqdm
     print("\n⏳ Generating report. Please wait...\n")
     all_section_text = ""
     for sub in tqdm(SUBFOLDERS, desc="📊 Building Sections", ncols=80):
-        time.sleep(0.1)  # optional: gives the progress bar smoother animation
         sub_path = os.path.join(case_path, sub)
         md_files = [
             f for f in os.listdir(sub_path)
@@ -377,6 +482,8 @@ def generate_case_report(case_id, use_ai=False):
 
         if full_text.strip():
             summary = generate_summary_for_section(sub, full_text, use_ai=use_ai)
+            if failures is not None and summary.startswith("_AI summary failed"):
+                failures.append(f"{sub}: {summary.strip('_')}")
             report_md += f"## {sub}\n"
             report_md += f"**Summary**:\n{summary}\n\n"
             report_md += "**Details**:\n"
@@ -385,6 +492,8 @@ def generate_case_report(case_id, use_ai=False):
 
     # Full case summary (AI or fallback)
     case_summary = generate_summary_for_section("Case Overview", all_section_text.strip(), use_ai=use_ai)
+    if failures is not None and case_summary.startswith("_AI summary failed"):
+        failures.append(f"Case Overview: {case_summary.strip('_')}")
     report_md = report_md.replace("## 📋", "## 📝 Summary\n" + case_summary + "\n\n---\n## 📋")
 
     # Add disclaimer
@@ -398,9 +507,52 @@ def generate_case_report(case_id, use_ai=False):
 
     print(f"\n✅ Report generated successfully:")
     print(f"📄 {md_output_path}")
+    return md_output_path
+
+def batch_generate_reports():
+    # 📦 Month-end run: a report for every case matching a filter, no per-case prompts
+    print("\n📦 Which cases should get a report?")
+    filters = ask_case_filters()
+    case_ids = caseBatch.select_cases(BASE_DIR, **filters)
+    if not case_ids:
+        print("📁 No cases match these filters." if caseIndex.has_filters(filters) else "📁 No cases found.")
+        return
+
+    print("\n📝 How would you like to generate the reports?")
+    print("1. Traditional method (no AI)")
+    print("2. Use ChatGPT (AI-powered summaries)")
+    method_choice = input("Enter choice (1 or 2): ").strip()
+    if method_choice not in ("1", "2"):
+        print("❌ Invalid choice.")
+        return
+    use_ai = method_choice == "2"
+    if use_ai and not get_api_key():
+        print("\n⚠️ No OpenAI API key found. Set one with option 8 first.")
+        return
+
+    existing = input("Existing reports: overwrite (o) or keep them and save new versions (n)? [o/n]: ").strip().lower()
+    on_existing = "version" if existing == "n" else "overwrite"
+    if input(f"Generate {len(case_ids)} report(s)? (y/n): ").strip().lower() != "y":
+        print("❌ Cancelled.")
+        return
+
+    print(f"\n⏳ Generating {len(case_ids)} report(s)...\n")
+    summary = caseBatch.run_batch(sys.modules[__name__], case_ids, use_ai=use_ai, on_existing=on_existing,
+                                  progress=caseBatch.print_progress)
+
+    table = []
+    for r in summary["results"]:
+        outcome = os.path.basename(r["path"]) if r["ok"] else r["error"]
+        table.append([r["case_id"], "✅" if r["ok"] else "❌", f"{r['seconds']:.2f}s", outcome])
+    print(tabulate(table, headers=["Case ID", "OK", "Time", "Report / Error"], tablefmt="fancy_grid"))
+    print(f"📊 {summary['succeeded']} succeeded, {summary['failed']} failed in "
+          f"{summary['wall_seconds']:.1f}s ({summary['workers']} worker{'s' if summary['workers'] != 1 else ''})")
+    print(f"🧾 Run summary saved to {summary['summary_path']}")
 
 def menu():
     os.makedirs(BASE_DIR, exist_ok=True)
+    caseIndex.ensure_index(BASE_DIR)
+    caseIndex.reconcile(BASE_DIR)  # pick up edits made outside the tool (e.g. in Obsidian)
     while True:
         print("\n📂 Investigation Case Manager")
         print(tabulate([
@@ -412,6 +564,9 @@ def menu():
             ["6", "Generate Case Report"],
             ["7", "Open Case in Obsidian"],
             ["8", "Manage API Key"],
+            ["9", "Search Cases"],
+            ["10", "Indicator Lookup"],
+            ["11", "Batch Generate Reports"],
             ["99", "Exit"]
         ], headers=["Option", "Action"], tablefmt="grid"))
 
@@ -459,7 +614,7 @@ def menu():
 
 
         elif choice == "2":
-            list_cases()
+            browse_cases()
         elif choice == "3":
             case_id = select_case()
             if case_id:
@@ -467,6 +622,8 @@ def menu():
         elif choice == "4":
             case_id = select_case()
             if case_id:
+                # Remember what we saw, so a concurrent edit isn't silently overwritten
+                version = caseMeta.read_revision(os.path.join(BASE_DIR, f"Case_{case_id}"))
                 # Select new case status
                 print("Select new case status:")
                 print("1. Open")
@@ -494,7 +651,7 @@ def menu():
                     print("❌ Invalid payment status selection.")
                     return
 
-                update_status_and_payment(case_id, new_status, new_payment_status)
+                update_status_and_payment(case_id, new_status, new_payment_status, expected_version=version)
 
 
         elif choice == "5":
@@ -535,6 +692,12 @@ def menu():
                 open_case_in_obsidian(case_id)
         elif choice == "8":
             manage_api_key()
+        elif choice == "9":
+            search_cases()
+        elif choice == "10":
+            lookup_indicator()
+        elif choice == "11":
+            batch_generate_reports()
 
         elif choice == "99":
             print("👋 Exiting.")
@@ -543,4 +706,8 @@ def menu():
             print("❓ Invalid choice. Try again.")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Subcommands (create/list/show/update/delete/report) run without prompts
+        import caseCli
+        sys.exit(caseCli.run(sys.modules[__name__], sys.argv[1:]))
     menu()
@@ -0,0 +1,228 @@
+import json
+import os
+from datetime import datetime
+
+import caseNotes
+
+# case.json is the authoritative, versioned record for a case. notes.txt is
+# still written next to it (reports, view_case and Obsidian users read it), and
+# a notes.txt edited by hand after case.json is picked up on the next read.
+META_FILENAME = "case.json"
+SCHEMA_VERSION = 1
+
+STATUSES = ["Open", "Closed"]
+PAYMENT_STATUSES = ["Not Paid", "Partial Payment", "Paid"]
+
+# notes.txt label -> record field
+LEGACY_FIELDS = {
+    "Case ID": "case_id",
+    "Status": "status",
+    "Description": "description",
+    "Payment Status": "payment_status",
+    "Created": "created",
+    "Tags": "tags",
+}
+FIELD_LABELS = {field: label for label, field in LEGACY_FIELDS.items()}
+EDITABLE_FIELDS = ("status", "description", "payment_status", "tags")
+
+
+def meta_path(case_path):
+    return os.path.join(case_path, META_FILENAME)
+
+
+def canonical_option(value, allowed):
+    # Known values are matched case-insensitively; anything else is kept as
+    # written so a migration never throws information away
+    value = str(value).strip()
+    for option in allowed:
+        if value.lower() == option.lower():
+            return option
+    return value
+
+
+def parse_timestamp(value):
+    # ISO 8601 for anything datetime understands (including str(datetime.now())
+    # as written by older versions); unparseable text is kept verbatim
+    if isinstance(value, datetime):
+        return value.isoformat()
+    value = str(value or "").strip()
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        return value
+
+
+def display_timestamp(value):
+    try:
+        return datetime.fromisoformat(value).isoformat(sep=" ")
+    except (TypeError, ValueError):
+        return value or ""
+
+
+def parse_tags(value):
+    if isinstance(value, str):
+        value = value.split(",")
+    tags = []
+    for tag in value or ():
+        tag = str(tag).strip()
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def normalize(record):
+    return {
+        "schema": SCHEMA_VERSION,
+        "revision": int(record.get("revision") or 0),
+        "case_id": str(record.get("case_id", "")),
+        "status": canonical_option(record.get("status", ""), STATUSES),
+        "description": " ".join(str(record.get("description", "")).splitlines()).strip(),
+        "payment_status": canonical_option(record.get("payment_status", ""), PAYMENT_STATUSES),
+        "created": parse_timestamp(record.get("created")),
+        "updated": parse_timestamp(record.get("updated") or record.get("created")),
+        "tags": parse_tags(record.get("tags")),
+        "extra_lines": [str(line) for line in record.get("extra_lines") or ()],
+    }
+
+
+def make_record(case_id, status, description, payment_status="Not Paid", created=None, tags=()):
+    created = created or datetime.now()
+    return normalize({
+        "case_id": case_id,
+        "status": status,
+        "description": description,
+        "payment_status": payment_status,
+        "created": created,
+        "tags": list(tags),
+    })
+
+
+def from_notes(text, case_id=""):
+    # Single pass over a legacy notes.txt. The first line for each known label
+    # fills the field; every other line is kept verbatim, in order, so
+    # rendering the record gives back the same text.
+    fields = {}
+    extra_lines = []
+    for line in text.splitlines():
+        label, sep, value = line.partition(":")
+        field = LEGACY_FIELDS.get(label.strip()) if sep else None
+        if field and field not in fields:
+            fields[field] = value.strip()
+        else:
+            extra_lines.append(line)
+    fields.setdefault("case_id", case_id)
+    fields["extra_lines"] = extra_lines
+    return normalize(fields)
+
+
+def render_notes(record):
+    lines = [
+        f"Case ID: {record['case_id']}",
+        f"Status: {record['status']}",
+        f"Description: {record['description']}",
+        f"Payment Status: {record['payment_status']}",
+        f"Created: {display_timestamp(record['created'])}",
+    ]
+    if record["tags"]:
+        lines.append(f"Tags: {', '.join(record['tags'])}")
+    lines.extend(record["extra_lines"])
+    return "\n".join(lines) + "\n"
+
+
+def _stat(path):
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+def read(case_path):
+    # The case's record without writing anything (safe for the index scan).
+    # Returns (record, needs_save): needs_save is True when the record came
+    # from a legacy or hand-edited notes.txt rather than case.json.
+    json_path = meta_path(case_path)
+    notes_path = os.path.join(case_path, caseNotes.NOTES_FILENAME)
+    json_st = _stat(json_path)
+    notes_st = _stat(notes_path)
+
+    stored = None
+    if json_st is not None:
+        try:
+            with open(json_path, "r") as f:
+                stored = normalize(json.load(f))
+        except (OSError, ValueError, TypeError):
+            stored = None
+        if stored is not None and (notes_st is None or notes_st.st_mtime_ns <= json_st.st_mtime_ns):
+            return stored, False
+
+    if notes_st is None:
+        return stored, False
+    with open(notes_path, "r") as f:
+        record = from_notes(f.read(), os.path.basename(case_path).replace("Case_", "", 1))
+    if stored is not None:
+        record["revision"] = stored["revision"]
+        record["updated"] = stored["updated"]
+        if record["created"] == "":
+            record["created"] = stored["created"]
+    return record, True
+
+
+def save(case_path, record):
+    # notes.txt first, then case.json, so case.json is never the older file
+    # of the two. Callers updating an existing case must hold caseNotes.locked.
+    caseNotes.write_atomic(os.path.join(case_path, caseNotes.NOTES_FILENAME), render_notes(record))
+    caseNotes.write_atomic(meta_path(case_path), json.dumps(record, indent=2, ensure_ascii=False) + "\n")
+
+
+def load(case_path):
+    # read(), migrating legacy cases to case.json on the way
+    record, needs_save = read(case_path)
+    if record is not None and needs_save:
+        with caseNotes.locked(case_path):
+            record, needs_save = read(case_path)
+            if needs_save:
+                save(case_path, record)
+    return record
+
+
+def read_revision(case_path):
+    record, _ = read(case_path)
+    return None if record is None else record["revision"]
+
+
+def update_case(case_path, changes=None, expected_revision=None, add_tags=(), remove_tags=()):
+    # Locked read-modify-write. With expected_revision, raises
+    # caseNotes.NotesConflict if another writer saved the case since the caller
+    # read it. Returns the saved record.
+    with caseNotes.locked(case_path):
+        record, _ = read(case_path)
+        if record is None:
+            raise FileNotFoundError(meta_path(case_path))
+        if expected_revision is not None and str(record["revision"]) != str(expected_revision):
+            raise caseNotes.NotesConflict(case_path)
+        for field, value in (changes or {}).items():
+            if field in EDITABLE_FIELDS:
+                record[field] = value
+        tags = [t for t in parse_tags(record["tags"]) if t not in set(remove_tags)]
+        record["tags"] = tags + [t for t in parse_tags(list(add_tags)) if t not in tags]
+        record["revision"] += 1
+        record["updated"] = datetime.now()
+        record = normalize(record)
+        save(case_path, record)
+        return record
+
+
+def migrate_tree(base_dir):
+    # Write case.json for every case that only has a legacy notes.txt
+    migrated = []
+    if not os.path.isdir(base_dir):
+        return migrated
+    with os.scandir(base_dir) as it:
+        for entry in it:
+            if not entry.name.startswith("Case_") or not entry.is_dir():
+                continue
+            notes_exists = os.path.exists(os.path.join(entry.path, caseNotes.NOTES_FILENAME))
+            if notes_exists and not os.path.exists(meta_path(entry.path)):
+                load(entry.path)
+                migrated.append(entry.name.replace("Case_", "", 1))
+    return sorted(migrated)
@@ -0,0 +1,62 @@
+import contextlib
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, but writes below are still atomic
+    fcntl = None
+
+NOTES_FILENAME = "notes.txt"
+LOCK_FILENAME = ".notes.lock"  # hidden, so the index scan ignores it
+
+
+class NotesConflict(Exception):
+    # The case was saved again between the caller reading it and asking to update it
+    pass
+
+
+def notes_path(base_dir, case_id):
+    return os.path.join(base_dir, f"Case_{case_id}", NOTES_FILENAME)
+
+
+@contextlib.contextmanager
+def locked(case_path):
+    # Exclusive advisory lock shared by every process updating this case. The
+    # lock file is left in place: unlinking it would let two processes lock
+    # different inodes at once.
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(os.path.join(case_path, LOCK_FILENAME), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # closing releases the lock
+
+
+def write_atomic(path, text):
+    # Write a sibling temp file, fsync it, then rename over the original, so
+    # readers see either the old or the new file and never a partial one.
+    folder = os.path.dirname(path)
+    tmp_path = os.path.join(folder, f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(folder, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)  # make the rename itself survive a crash
+        finally:
+            os.close(dir_fd)
+
@@ -0,0 +1,135 @@
+import os
+import re
+import shutil
+
+from colorama import Fore, Style
+
+URL_RE = re.compile(r"https?://[^\s)]+")
+URL_MAX_LEN = 30
+MAX_LINE_BYTES = 4096  # longer lines are shown in pieces, so a page has a fixed size cap
+
+PROMPT = "[n]ext page  [p]rev page  [f]ile ▶  [b]ack a file ◀  [s]ection  [g]o to file  [q]uit: "
+
+
+def _shorten(match):
+    url = match.group(0)
+    return url[:URL_MAX_LEN] + "..." if len(url) > URL_MAX_LEN else url
+
+
+def shorten_urls(line):
+    return URL_RE.sub(_shorten, line)
+
+
+def format_line(line):
+    if line.startswith("#"):
+        return Fore.GREEN + Style.BRIGHT + line
+    return Fore.WHITE + shorten_urls(line)
+
+
+def page_size():
+    # Lines per page: what fits on screen under the header and the prompt
+    return max(5, shutil.get_terminal_size((120, 30)).lines - 6)
+
+
+def _partial_char_length(raw):
+    # Bytes at the end of raw that begin a UTF-8 character the line cap cut short
+    for back in range(1, min(4, len(raw)) + 1):
+        byte = raw[-back]
+        if byte & 0xC0 == 0x80:  # continuation byte: keep looking for the lead byte
+            continue
+        width = 4 if byte >= 0xF0 else 3 if byte >= 0xE0 else 2 if byte >= 0xC0 else 1
+        return back if width > back else 0
+    return 0
+
+
+def read_page(path, offset, max_lines):
+    # Up to max_lines non-blank lines starting at byte offset. Returns
+    # (lines, offset of the next page, whether the file ends after this page).
+    lines = []
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while len(lines) < max_lines:
+            raw = f.readline(MAX_LINE_BYTES)
+            if not raw:
+                return lines, f.tell(), True
+            if not raw.endswith(b"\n"):
+                # Capped mid-line: leave a split character for the next piece
+                cut = _partial_char_length(raw)
+                if 0 < cut < len(raw):
+                    f.seek(-cut, os.SEEK_CUR)
+                    raw = raw[:-cut]
+            line = raw.decode("utf-8", errors="replace").rstrip()
+            if line.strip():
+                lines.append(line)
+        return lines, f.tell(), not f.peek(1)
+
+
+def _pick(options, prompt):
+    for n, label in enumerate(options, start=1):
+        print(f"{n}. {label}")
+    choice = input(prompt).strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(options):
+        return int(choice) - 1
+    print("❌ Invalid selection.")
+    return None
+
+
+def page_through(sections, page_lines=None):
+    # sections: [(section name, [file paths])]. Shows one page at a time. Only
+    # the page on screen is in memory, plus the byte offsets where the pages
+    # seen so far in the current file start, so [p] can step back.
+    files = [(name, path) for name, paths in sections for path in paths]
+    if not files:
+        print("📭 No notes to show.")
+        return
+    page_lines = page_lines or page_size()
+    index = 0
+    offsets = [0]
+
+    while True:
+        section, path = files[index]
+        try:
+            lines, next_offset, at_end = read_page(path, offsets[-1], page_lines)
+        except OSError as e:
+            lines, next_offset, at_end = [f"⚠️ Could not read file: {e}"], 0, True
+
+        print("\n" + Fore.CYAN + Style.BRIGHT + f"=== {section} ===")
+        print(Fore.YELLOW + f"📄 {os.path.basename(path)}  (file {index + 1}/{len(files)}, page {len(offsets)})")
+        for line in lines:
+            print(format_line(line))
+        if at_end:
+            print("-" * 40)
+
+        choice = input(PROMPT).strip().lower()
+        if choice in ("", "n"):
+            if not at_end:
+                offsets.append(next_offset)
+            elif index + 1 < len(files):
+                index, offsets = index + 1, [0]
+            else:
+                return
+        elif choice == "p":
+            if len(offsets) > 1:
+                offsets.pop()
+            elif index > 0:
+                index, offsets = index - 1, [0]
+        elif choice == "f":
+            if index + 1 < len(files):
+                index, offsets = index + 1, [0]
+        elif choice == "b":
+            if index > 0:
+                index, offsets = index - 1, [0]
+        elif choice == "s":
+            names = [name for name, paths in sections if paths]
+            picked = _pick(names, "Section number: ")
+            if picked is not None:
+                index = next(i for i, (name, _) in enumerate(files) if name == names[picked])
+                offsets = [0]
+        elif choice == "g":
+            picked = _pick([f"{name} / {os.path.basename(p)}" for name, p in files], "File number: ")
+            if picked is not None:
+                index, offsets = picked, [0]
+        elif choice == "q":
+            return
+        else:
+            print("❌ Invalid choice.")
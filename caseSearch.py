@@ -0,0 +1,98 @@
+import os
+import re
+from itertools import islice
+
+import caseIndex
+
+TOKEN_RE = re.compile(r"\w{2,}")
+MAX_RESULTS = 50
+COUNT_CAP = 5000  # postings counted per term when choosing the rarest one
+
+
+caseIndex.register_schema("""
+    CREATE TABLE IF NOT EXISTS postings (
+        term TEXT NOT NULL,
+        case_id TEXT NOT NULL,
+        rel_path TEXT NOT NULL,
+        line_no INTEGER NOT NULL,
+        PRIMARY KEY (term, case_id, rel_path, line_no)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS postings_by_file ON postings (case_id, rel_path);
+""")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def index_file(conn, case_id, rel_path, full_path):
+    # Registered with caseIndex: called for every added/changed/removed .md file
+    conn.execute("DELETE FROM postings WHERE case_id = ? AND rel_path = ?", (case_id, rel_path))
+    if full_path is None:
+        return
+    rows = []
+    try:
+        with open(full_path, "r", errors="replace") as f:
+            for line_no, line in enumerate(f, start=1):
+                for term in set(tokenize(line)):
+                    rows.append((term, case_id, rel_path, line_no))
+    except OSError:
+        return
+    conn.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?, ?, ?)", rows)
+
+
+caseIndex.register_file_handler(index_file, "search_built")
+
+
+def ensure_search_index(base_dir):
+    return caseIndex.ensure_handler_index(base_dir, index_file)
+
+
+def _read_line(path, line_no):
+    try:
+        with open(path, "r", errors="replace") as f:
+            return next(islice(f, line_no - 1, None), "").strip()
+    except OSError:
+        return ""
+
+
+def search(base_dir, query, limit=MAX_RESULTS):
+    # All query terms must appear on the same line. The rarest term drives the
+    # scan in primary-key order and every other term is a point lookup per
+    # candidate line, so LIMIT stops the scan after the first matches.
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return []
+    conn = ensure_search_index(base_dir)
+
+    # Capped counts: enough to rank terms without walking a huge posting list
+    counts = {
+        term: conn.execute(
+            "SELECT COUNT(*) FROM (SELECT 1 FROM postings WHERE term = ? LIMIT ?)", (term, COUNT_CAP)
+        ).fetchone()[0]
+        for term in terms
+    }
+    if not all(counts.values()):
+        return []
+    terms.sort(key=counts.get)
+
+    probes = "".join(
+        " AND EXISTS (SELECT 1 FROM postings WHERE term = ? AND case_id = p.case_id "
+        "AND rel_path = p.rel_path AND line_no = p.line_no)"
+        for _ in terms[1:]
+    )
+    rows = conn.execute(
+        f"SELECT p.case_id, p.rel_path, p.line_no FROM postings p WHERE p.term = ?{probes} "
+        "ORDER BY p.case_id, p.rel_path, p.line_no LIMIT ?",
+        (*terms, limit)
+    ).fetchall()
+
+    return [
+        {
+            "case_id": row["case_id"],
+            "path": row["rel_path"],
+            "line": row["line_no"],
+            "text": _read_line(os.path.join(base_dir, f"Case_{row['case_id']}", row["rel_path"]), row["line_no"]),
+        }
+        for row in rows
+    ]
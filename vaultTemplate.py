@@ -0,0 +1,163 @@
+import ctypes
+import ctypes.util
+import errno
+import fnmatch
+import os
+import shutil
+import sys
+import tempfile
+
+# auto     reflink every file where the filesystem supports it (APFS, Btrfs, XFS),
+#          otherwise hardlink immutable assets and copy the files Obsidian rewrites
+# reflink  like auto, but never hardlink
+# hardlink hardlink immutable assets even where reflinks would work
+# copy     plain copies, same as shutil.copytree
+PROVISION_MODE = os.getenv("VAULT_PROVISION_MODE", "auto")
+MODES = ("auto", "reflink", "hardlink", "copy")
+
+# Files Obsidian writes to while a vault is open. They must never share an
+# inode with the template or another case, so they are always copied or cloned.
+MUTABLE_PATTERNS = [
+    "workspace*",
+    "app.json",
+    "appearance.json",
+    "core-plugins*.json",
+    "community-plugins.json",
+    "hotkeys.json",
+    "graph.json",
+    "bookmarks.json",
+    "backlink.json",
+    "page-preview.json",
+    "types.json",
+    "plugins/*/data.json",
+    "snippets/*",
+]
+
+FICLONE = 0x40049409  # Linux ioctl: share extents between two files
+UNSUPPORTED_ERRNOS = {errno.EOPNOTSUPP, errno.ENOTSUP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.ENOSYS}
+
+# (source device, target device) -> whether reflinks work there; probed once
+_reflink_support = {}
+_clonefile = None
+
+
+def is_mutable(rel_path):
+    rel_path = rel_path.replace(os.sep, "/")
+    return any(fnmatch.fnmatch(rel_path, pattern) for pattern in MUTABLE_PATTERNS)
+
+
+def _macos_clonefile():
+    global _clonefile
+    if _clonefile is None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        _clonefile = libc.clonefile
+        _clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+        _clonefile.restype = ctypes.c_int
+    return _clonefile
+
+
+def _reflink(src, dst):
+    # Raises OSError when the filesystem cannot clone; dst is left absent
+    if sys.platform == "darwin":
+        if _macos_clonefile()(os.fsencode(src), os.fsencode(dst), 0) != 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), dst)
+        return
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.ENOTSUP, "reflinks not supported on this platform", dst)
+
+    import fcntl
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            os.remove(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+def _try_reflink(src, dst, devices):
+    if _reflink_support.get(devices) is False:
+        return False
+    try:
+        _reflink(src, dst)
+    except OSError as e:
+        if e.errno in UNSUPPORTED_ERRNOS:
+            _reflink_support[devices] = False
+            return False
+        raise
+    _reflink_support[devices] = True
+    return True
+
+
+def _try_hardlink(src, dst):
+    try:
+        os.link(src, dst)
+        return True
+    except OSError as e:
+        if e.errno in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EOPNOTSUPP):
+            return False
+        raise
+
+
+def place_file(src, dst, rel_path, mode, devices):
+    # Returns the method used: "reflink", "hardlink" or "copy"
+    if mode != "copy":
+        if mode == "hardlink" and not is_mutable(rel_path) and _try_hardlink(src, dst):
+            return "hardlink"
+        if _try_reflink(src, dst, devices):
+            return "reflink"
+        if mode == "auto" and not is_mutable(rel_path) and _try_hardlink(src, dst):
+            return "hardlink"
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+def provision(template, dest, mode=None):
+    # Recreate the template tree at dest (which must not exist yet — raises
+    # FileExistsError like copytree). Returns counts per method used. The
+    # tree is built in a hidden temp folder beside dest and renamed into
+    # place, so a failure part-way never leaves a half-built vault behind.
+    mode = mode or PROVISION_MODE
+    if mode not in MODES:
+        mode = "auto"
+    if os.path.lexists(dest):
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), dest)
+    parent = os.path.dirname(os.path.abspath(dest))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{os.path.basename(dest)}.", suffix=".partial", dir=parent)
+    try:
+        stats = _build(template, staging, mode)
+        os.replace(staging, dest)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return stats
+
+
+def _build(template, dest, mode):
+    stats = {"reflink": 0, "hardlink": 0, "copy": 0, "symlink": 0, "bytes": 0}
+    devices = (os.stat(template).st_dev, os.stat(dest).st_dev)
+    for root, dirs, files in os.walk(template):
+        rel_root = os.path.relpath(root, template)
+        target_root = dest if rel_root == "." else os.path.join(dest, rel_root)
+        for name in dirs:
+            src = os.path.join(root, name)
+            if os.path.islink(src):
+                os.symlink(os.readlink(src), os.path.join(target_root, name))
+                stats["symlink"] += 1
+            else:
+                os.mkdir(os.path.join(target_root, name))
+        for name in files:
+            src = os.path.join(root, name)
+            dst = os.path.join(target_root, name)
+            if os.path.islink(src):
+                os.symlink(os.readlink(src), dst)
+                stats["symlink"] += 1
+                continue
+            rel_path = name if rel_root == "." else os.path.join(rel_root, name)
+            stats[place_file(src, dst, rel_path, mode, devices)] += 1
+            stats["bytes"] += os.path.getsize(src)
+    shutil.copystat(template, dest)
+    return stats